@@ -0,0 +1,55 @@
+"""Approval queue benchmark.
+
+Queues hundreds of pending drops, then times adding, paging, approving and
+rejecting in random order, and checks that approved batches leave the
+totals equal to what /recalculate_points would compute.
+
+    python benchmarks/bench_approvals.py [--pending 500] [--budget-ms 50]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+
+from fake_discord import check_totals, load_bot, timed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pending", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="p99 budget for approving one page")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        event = load_bot(workdir).events.default
+        members = [(member["discord_user"], team) for team, members in event.team_roster.items() for member in members]
+        entries = list(event.drop_catalog.values())
+
+        add_ms, page_ms, approve_ms, reject_ms = [], [], [], []
+        for submission_id in range(args.pending):
+            user, team = rng.choice(members)
+            timed(event.queue_drop, submission_id, user, team, rng.choice(entries), user, samples=add_ms)
+        while len(event.approvals):
+            page, _ = timed(event.approvals.page, rng.randrange(event.approvals.pages()), samples=page_ms)
+            ids = [pending["id"] for pending in rng.sample(page, rng.randint(1, len(page)))]
+            if rng.random() < 0.8:
+                timed(event.approve, ids, samples=approve_ms)
+            else:
+                timed(event.reject, ids, samples=reject_ms)
+        event.storage.close()
+
+    for label, samples in (("add", add_ms), ("page", page_ms), ("approve", approve_ms), ("reject", reject_ms)):
+        samples.sort()
+        print(f"{label:<10} n={len(samples):<5} p50={statistics.median(samples):.4f}ms p99={samples[int(len(samples) * 0.99)]:.4f}ms")
+
+    failures = check_totals(event)
+    if approve_ms[int(len(approve_ms) * 0.99)] > args.budget_ms:
+        print(f"FAIL: approving a page took over the {args.budget_ms}ms budget at p99")
+        failures += 1
+    print("FAIL" if failures else "OK")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Autocomplete latency microbenchmark.
+
+Builds the autocomplete indexes over drops.json scaled up 10x and replays
+keystroke-by-keystroke queries against them. Exits non-zero if the p99 lookup
+goes over the latency budget.
+
+    python benchmarks/bench_autocomplete.py [--scale 10] [--budget-ms 1.0]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(REPO_ROOT)
+sys.path.insert(0, REPO_ROOT)
+
+from extravaganza_bot import AutocompleteIndex  # noqa: E402
+
+QUERIES = [
+    "tombs of amscut",
+    "zulrah",
+    "vorkath",
+    "chambers of xeric",
+    "any unique",
+    "magic fang",
+    "godsword shard",
+    "hydra",
+    "nightmare",
+    "ar",
+]
+
+def scaled_catalog(scale):
+    with open("drops.json", "r", encoding="utf-8") as f:
+        boss_drops = json.load(f)
+    catalog = {}
+    for copy_number in range(scale):
+        suffix = "" if copy_number == 0 else f" {copy_number}"
+        for boss_name, drops in boss_drops.items():
+            catalog[f"{boss_name}{suffix}"] = [
+                {"drop": f"{drop['drop']}{suffix}", "points": drop["points"]} for drop in drops
+            ]
+    return catalog
+
+def keystrokes(query):
+    return [query[:i] for i in range(1, len(query) + 1)]
+
+def time_lookups(index, queries, rounds):
+    samples = []
+    for _ in range(rounds):
+        # A fresh cache per round so every keystroke is a real lookup on the first pass
+        index._cache.clear()
+        for query in queries:
+            for prefix in keystrokes(query):
+                start = time.perf_counter()
+                index.search(prefix)
+                samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def report(label, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{label:<28} n={len(samples):<6} p50={p50:.4f}ms p99={p99:.4f}ms max={samples[-1]:.4f}ms")
+    return p99
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    catalog = scaled_catalog(args.scale)
+    drop_names = [drop["drop"] for drops in catalog.values() for drop in drops]
+    print(f"{len(catalog)} bosses, {len(drop_names)} drops (scale x{args.scale})")
+
+    start = time.perf_counter()
+    boss_index = AutocompleteIndex(catalog.keys())
+    all_drops_index = AutocompleteIndex(drop_names)
+    # Indexes build lazily on their first search; time that here rather than in the first lookup
+    boss_index.search("")
+    all_drops_index.search("")
+    print(f"index build: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    p99s = [
+        report("boss names (uncached)", time_lookups(boss_index, QUERIES, args.rounds)),
+        report("all drops (uncached)", time_lookups(all_drops_index, QUERIES, args.rounds)),
+    ]
+    if max(p99s) > args.budget_ms:
+        print(f"FAIL: p99 over {args.budget_ms}ms budget")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Bulk import benchmark.
+
+Builds a CSV of random (team, boss, drop, count) rows, runs it through
+/drop_bulk with a fake interaction, and checks the resulting totals
+against what /recalculate_points would compute from the drop counts.
+
+    python benchmarks/bench_bulk.py [--rows 10000] [--budget-ms 1000]
+"""
+import argparse
+import asyncio
+import csv
+import io
+import random
+import sys
+import tempfile
+import time
+
+from fake_discord import FakeAttachment, FakeInteraction, check_totals, load_bot
+
+def synthetic_csv(event, rows, rng):
+    teams = list(event.team_roster)
+    entries = list(event.drop_catalog.values())
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["team", "boss", "drop", "count", "player"])
+    for _ in range(rows):
+        team = rng.choice(teams)
+        entry = rng.choice(entries)
+        # Mixed casing and spacing, like hand-edited spreadsheets
+        drop_name = entry.drop.upper() if rng.random() < 0.1 else entry.drop
+        player = rng.choice(event.team_roster[team])["discord_user"] if rng.random() < 0.5 else ""
+        writer.writerow([team, entry.boss, drop_name, rng.randint(1, 3), player])
+    return out.getvalue().encode()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        bot = load_bot(workdir)
+        event = bot.events.default
+        data = synthetic_csv(event, args.rows, random.Random(args.seed))
+        admin = event.admins[0]
+        interaction = FakeInteraction(admin)
+
+        start = time.perf_counter()
+        asyncio.run(bot.drop_bulk.callback(interaction, FakeAttachment("drops.csv", data)))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        event.storage.close()
+
+    print(f"{args.rows} rows ({len(data) // 1024}KB) imported in {elapsed_ms:.1f}ms")
+    failures = 0
+    summary = interaction.followup.sent[0].kwargs["embed"]
+    if summary.title != "Bulk Import":
+        print(f"FAIL: {summary.title}: {summary.description}")
+        failures += 1
+    failures += check_totals(event)
+    credited = sum(event.player_points.values())
+    attributed = sum(
+        event.find_drop(boss_name, drop_name) is not None
+        for bosses in event.drop_contributors.values()
+        for boss_name, drops in bosses.items()
+        for drop_name, players in drops.items()
+        for player in players
+        if player is not None
+    )
+    if attributed and not credited:
+        print("FAIL: attributed drops weren't credited to players")
+        failures += 1
+    if elapsed_ms > args.budget_ms:
+        print(f"FAIL: took {elapsed_ms:.1f}ms, over the {args.budget_ms}ms budget")
+        failures += 1
+    print("FAIL" if failures else "OK")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Points history benchmark.
+
+Fills PointsHistory with a two-week event (a drop every few minutes per
+team), then times recording, series extraction and rendering the points
+race chart, and checks the series against a replay of the same drops.
+
+    python benchmarks/bench_history.py [--teams 5] [--days 14] [--budget-ms 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(REPO_ROOT)
+sys.path.insert(0, REPO_ROOT)
+
+from extravaganza_bot import PointsHistory, render_points_history_png  # noqa: E402
+from fake_discord import timed  # noqa: E402
+
+def synthetic_drops(teams, days, rng, start=1_700_000_000):
+    drops = []
+    for t in range(teams):
+        now = start
+        total = 0
+        while now < start + days * 86400:
+            now += rng.expovariate(1 / 600)
+            total += rng.choice((50, 100, 230, 500, 1200))
+            drops.append((now, f"Team {t}", total))
+    drops.sort()
+    return drops
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=5)
+    parser.add_argument("--days", type=float, default=14)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="series + render budget")
+    args = parser.parse_args()
+
+    drops = synthetic_drops(args.teams, args.days, random.Random(1))
+    history = PointsHistory(capacity=int(args.days * 86400 // 300) + 1)
+
+    start = time.perf_counter()
+    for ts, team, total in drops:
+        history.record(team, total, ts)
+    record_us = (time.perf_counter() - start) / len(drops) * 1e6
+    print(f"{len(drops)} drops over {args.days:g} days, {args.teams} teams")
+    print(f"record:          {record_us:8.3f}us per drop")
+
+    (timestamps, series), series_ms = timed(lambda: history.series(), rounds=args.rounds)
+    colors = {team: (0.2, 0.4, 0.6) for team in series}
+    png, render_ms = timed(lambda: render_points_history_png(timestamps, series, colors), rounds=args.rounds)
+    memory_kb = sum(values.itemsize * len(values) for values in history._series.values()) / 1024
+    print(f"series:          {series_ms:8.3f}ms ({len(timestamps)} points per team)")
+    print(f"render:          {render_ms:8.3f}ms ({len(png) // 1024}KB png)")
+    print(f"ring memory:     {memory_kb:8.1f}KB")
+
+    # Each plotted point must equal the team's total at the end of that bucket
+    latest = {}
+    i = 0
+    for bucket_ts, values in zip(timestamps, zip(*series.values())):
+        while i < len(drops) and drops[i][0] < bucket_ts + history.bucket_seconds:
+            latest[drops[i][1]] = drops[i][2]
+            i += 1
+        expected = tuple(latest.get(team, 0) for team in series)
+        if values != expected:
+            print(f"FAIL: bucket {bucket_ts} has {values}, expected {expected}")
+            return 1
+
+    if series_ms + render_ms > args.budget_ms:
+        print(f"FAIL: series + render took {series_ms + render_ms:.3f}ms, over the {args.budget_ms}ms budget")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Rescoring benchmark.
+
+Times ScoringEngine (the vectorized /recalculate_points and /rescore_preview
+path) on a synthetic event with many teams and a large drop catalog, and
+checks its totals against a straightforward per-drop loop.
+
+    python benchmarks/bench_rescore.py [--teams 50] [--entries 5000] [--budget-ms 10]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(REPO_ROOT)
+sys.path.insert(0, REPO_ROOT)
+
+from extravaganza_bot import ScoringEngine, compile_catalog, total_drop_points  # noqa: E402
+from fake_discord import timed  # noqa: E402
+
+def synthetic_event(teams, entries, fill, rng):
+    boss_drops = {}
+    for i in range(entries):
+        drop = {"drop": f"Drop {i}", "points": rng.randint(10, 6000)}
+        if i % 50 == 0:
+            drop["full_value_count"] = 4
+        boss_drops.setdefault(f"Boss {i // 10}", []).append(drop)
+    catalog = compile_catalog(boss_drops)
+
+    drop_counts = {}
+    keys = list(catalog)
+    for t in range(teams):
+        bosses = drop_counts.setdefault(f"Team {t}", {})
+        for boss_name, drop_name in rng.sample(keys, int(len(keys) * fill)):
+            bosses.setdefault(boss_name, {})[catalog[(boss_name, drop_name)].drop] = rng.randint(1, 8)
+    return catalog, drop_counts
+
+def reference_totals(catalog, drop_counts):
+    totals = {}
+    for team, bosses in drop_counts.items():
+        totals[team] = sum(
+            total_drop_points(catalog[(boss_name, drop_name.lower())], count)
+            for boss_name, drops in bosses.items()
+            for drop_name, count in drops.items()
+        )
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, default=50)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--fill", type=float, default=0.02, help="fraction of the catalog each team has dropped")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    catalog, drop_counts = synthetic_event(args.teams, args.entries, args.fill, random.Random(1))
+    teams = list(drop_counts)
+    print(f"{args.teams} teams, {len(catalog)} catalog entries, {args.fill:.0%} filled")
+
+    engine, build_ms = timed(lambda: ScoringEngine(catalog), rounds=args.rounds)
+    (counts, _), fill_ms = timed(lambda: engine.count_matrix(drop_counts, teams), rounds=args.rounds)
+    totals, score_ms = timed(lambda: engine.totals(counts), rounds=args.rounds)
+    _, reference_ms = timed(lambda: reference_totals(catalog, drop_counts), rounds=args.rounds)
+
+    print(f"engine build:    {build_ms:8.3f}ms")
+    print(f"count matrix:    {fill_ms:8.3f}ms")
+    print(f"vectorized pass: {score_ms:8.3f}ms")
+    print(f"per-drop loop:   {reference_ms:8.3f}ms (reference)")
+
+    expected = reference_totals(catalog, drop_counts)
+    for team, total in zip(teams, totals):
+        if not math.isclose(total, expected[team], rel_tol=1e-9):
+            print(f"FAIL: {team} scored {total}, expected {expected[team]}")
+            return 1
+
+    end_to_end = fill_ms + score_ms
+    if end_to_end > args.budget_ms:
+        print(f"FAIL: rescore took {end_to_end:.3f}ms, over the {args.budget_ms}ms budget")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Snapshot benchmark.
+
+Fills an event with a large drop history, then takes a snapshot while
+drops keep arriving. Reports how long the capture held the event loop
+against a plain deepcopy of the same state, checks that the snapshot
+holds exactly the state at capture time, and restores it.
+
+    python benchmarks/bench_snapshot.py [--drops 200000] [--budget-ms 5]
+"""
+import argparse
+import asyncio
+import copy
+import math
+import random
+import sys
+import tempfile
+import time
+
+from fake_discord import load_bot
+
+async def run(bot, event, rng, budget_ms):
+    entries = list(event.drop_catalog.values())
+    teams = list(event.team_roster)
+    expected = {
+        "team_drop_counts": copy.deepcopy(event.team_drop_counts),
+        "team_total_points": dict(event.team_total_points),
+        "drop_contributors": copy.deepcopy(event.drop_contributors),
+    }
+
+    start = time.perf_counter()
+    copy.deepcopy((event.team_drop_counts, event.drop_contributors))
+    deepcopy_ms = (time.perf_counter() - start) * 1000
+
+    stop = False
+    submitted = 0
+
+    async def keep_dropping():
+        nonlocal submitted
+        while not stop:
+            team = rng.choice(teams)
+            player = rng.choice(event.team_roster[team])["discord_user"]
+            await event.submit_drop(("bench", submitted), "bench", team, rng.choice(entries), player)
+            submitted += 1
+            await asyncio.sleep(0)
+
+    dropper = asyncio.create_task(keep_dropping())
+    start = time.perf_counter()
+    path = await event.snapshot("bench")
+    snapshot_ms = (time.perf_counter() - start) * 1000
+    stop = True
+    await dropper
+
+    capture_ms = bot.metrics.histograms[("snapshot_capture_seconds", None)].total * 1000
+    print(f"deepcopy of the state: {deepcopy_ms:8.2f}ms")
+    print(f"snapshot capture:      {capture_ms:8.2f}ms on the event loop")
+    print(f"snapshot total:        {snapshot_ms:8.2f}ms, {submitted} drops submitted meanwhile")
+
+    failures = 0
+    state = await asyncio.to_thread(bot.read_snapshot, path)
+    for key, value in expected.items():
+        if state[key] != value:
+            print(f"FAIL: snapshot {key} differs from the state at capture time")
+            failures += 1
+
+    event.restore(state)
+    totals = event.compute_team_points(event.team_drop_counts)
+    for team, points in expected["team_total_points"].items():
+        if not math.isclose(event.team_total_points[team], points, abs_tol=1e-6) or not math.isclose(totals[team], points, abs_tol=1e-6):
+            print(f"FAIL: {team} restored to {event.team_total_points[team]}, expected {points}")
+            failures += 1
+    if capture_ms > budget_ms:
+        print(f"FAIL: capture took {capture_ms:.2f}ms, over the {budget_ms}ms budget")
+        failures += 1
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drops", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="capture budget on the event loop")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        bot = load_bot(workdir)
+        event = bot.events.default
+        entries = list(event.drop_catalog.values())
+        rows = []
+        for _ in range(args.drops // 10):
+            team = rng.choice(list(event.team_roster))
+            player = rng.choice(event.team_roster[team])["discord_user"]
+            rows.append((team, rng.choice(entries), 10, player, player))
+        event.apply_bulk(rows)
+        event.storage.flush()
+        failures = asyncio.run(run(bot, event, rng, args.budget_ms))
+        event.storage.close()
+
+    print("FAIL" if failures else "OK")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
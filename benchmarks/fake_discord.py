@@ -0,0 +1,140 @@
+"""Local stand-ins for the discord.py objects the command handlers touch.
+
+Only the surface extravaganza_bot.py uses is implemented: interaction.user,
+.id, .namespace, .extras, .response, .followup and .channel, plus the
+channel returned by client.get_channel. Every send is recorded and can be
+given an artificial network delay.
+
+Also holds the timing and consistency helpers the benchmarks share.
+"""
+import asyncio
+import itertools
+import math
+import os
+import shutil
+import statistics
+import sys
+import time
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ids = itertools.count(1)
+
+class FakeMessage:
+    def __init__(self, channel, content=None, **kwargs):
+        self.id = next(_ids)
+        self.channel = channel
+        self.content = content
+        self.kwargs = kwargs
+
+    async def edit(self, **kwargs):
+        await self.channel._delay()
+        self.kwargs.update(kwargs)
+        return self
+
+    async def pin(self):
+        await self.channel._delay()
+        self.pinned = True
+
+class FakeChannel:
+    def __init__(self, channel_id=None, delay=0.0):
+        self.id = channel_id or next(_ids)
+        self.delay = delay
+        self.sent = []
+
+    async def _delay(self):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+    async def send(self, content=None, **kwargs):
+        await self._delay()
+        message = FakeMessage(self, content, **kwargs)
+        self.sent.append(message)
+        return message
+
+    async def fetch_message(self, message_id):
+        for message in self.sent:
+            if message.id == message_id:
+                return message
+        raise LookupError(message_id)
+
+class FakeResponse:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, content=None, **kwargs):
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to before")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self._done = True
+        self.sent.append((content, kwargs))
+
+    async def defer(self, **kwargs):
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to before")
+        self._done = True
+
+class FakeFollowup(FakeChannel):
+    pass
+
+class FakeInteraction:
+    def __init__(self, user_name, channel=None, delay=0.0, **namespace):
+        self.id = next(_ids)
+        self.user = types.SimpleNamespace(name=user_name, id=hash(user_name))
+        self.namespace = types.SimpleNamespace(**namespace)
+        self.extras = {}
+        self.guild_id = None
+        self.command = None
+        self.response = FakeResponse(delay)
+        self.followup = FakeFollowup(delay=delay)
+        self.channel = channel or FakeChannel(delay=delay)
+
+    async def edit_original_response(self, **kwargs):
+        pass
+
+class FakeAttachment:
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.data = data
+        self.size = len(data)
+
+    async def read(self):
+        return self.data
+
+def load_bot(workdir):
+    """Import extravaganza_bot against scratch copies of the data files in workdir."""
+    for name in ("drops.json", "team_roster.json"):
+        shutil.copy(os.path.join(REPO_ROOT, name), workdir)
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+    import extravaganza_bot
+    extravaganza_bot.events.default.load()
+    return extravaganza_bot
+
+def timed(fn, *args, rounds=1, samples=None):
+    """Call fn(*args) rounds times. Returns (last result, median ms); each round's ms also goes to samples."""
+    elapsed = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed.append((time.perf_counter() - start) * 1000)
+    if samples is not None:
+        samples.extend(elapsed)
+    return result, statistics.median(elapsed)
+
+def check_totals(event):
+    """Print a FAIL line for every team whose running total differs from a full recalculation. Returns how many."""
+    failures = 0
+    expected = event.compute_team_points(event.team_drop_counts)
+    for team, points in event.team_total_points.items():
+        if not math.isclose(points, expected.get(team, 0), abs_tol=1e-6):
+            print(f"FAIL: {team} total {points} != recalculated {expected.get(team, 0)}")
+            failures += 1
+    return failures
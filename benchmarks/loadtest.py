@@ -0,0 +1,201 @@
+"""Offline load test for the slash command handlers.
+
+Drives the real handlers in extravaganza_bot.py with the stand-ins from
+fake_discord.py, so no guild or token is needed. Scenarios:
+
+  drop_burst          /drop bursts from members of every team
+  autocomplete_storm  boss/drop autocomplete for every keystroke of many queries
+  team_stats_all      concurrent /team_stats_all
+  hourly_loops        post_standings alongside /team_stats_all
+  mixed               all of the above at once
+
+Reports throughput, p50/p99 latency and event-loop block time per scenario,
+and compares p99 with loadtest_baseline.json. Discord rate limits are not
+simulated; --delay-ms adds a fixed delay to every fake send.
+
+    python benchmarks/loadtest.py [--scale 1.0] [--update-baseline]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from fake_discord import FakeChannel, FakeInteraction, load_bot
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest_baseline.json")
+
+class LoopProbe:
+    """Times every event loop iteration, i.e. how long the loop went without a chance to run anything else.
+
+    A callback that reschedules itself with call_soon runs exactly once per iteration, so the
+    gap between two runs is one iteration's wall time. A final gap is taken on exit, so
+    jobs that never yield still show up as one long block.
+    """
+
+    def __init__(self):
+        self.lags = []
+        self._loop = None
+        self._handle = None
+        self._last = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.lags.append(now - self._last)
+        self._last = now
+        self._handle = self._loop.call_soon(self._tick)
+
+    def __enter__(self):
+        self._loop = asyncio.get_running_loop()
+        self._last = time.perf_counter()
+        self._handle = self._loop.call_soon(self._tick)
+        return self
+
+    def __exit__(self, *exc):
+        self._handle.cancel()
+        self.lags.append(time.perf_counter() - self._last)
+
+async def timed(latencies, coro, enqueued_at):
+    # From when the job was queued, so time spent waiting behind other jobs counts
+    await coro
+    latencies.append(time.perf_counter() - enqueued_at)
+
+class LoadTest:
+    def __init__(self, bot, scale, delay, rng):
+        self.bot = bot
+        self.scale = scale
+        self.delay = delay
+        self.rng = rng
+        self.event = bot.events.default
+        self.channel = FakeChannel(delay=delay)
+        self.members = [
+            (member["discord_user"], team)
+            for team, members in self.event.team_roster.items()
+            for member in members
+        ]
+        self.entries = list(self.event.drop_catalog.values())
+        bot.client.get_channel = lambda channel_id: self.channel
+        # Pacing is Discord's job; here it would only measure the sleep
+        bot.outbound = bot.OutboundDispatcher(per=0)
+
+    def n(self, count):
+        return max(1, int(count * self.scale))
+
+    def interaction(self, user_name, **namespace):
+        return FakeInteraction(user_name, channel=self.channel, delay=self.delay, **namespace)
+
+    def drop_burst(self):
+        jobs = []
+        for _ in range(self.n(2000)):
+            user_name, _ = self.rng.choice(self.members)
+            entry = self.rng.choice(self.entries)
+            jobs.append(self.bot.drop.callback(self.interaction(user_name), entry.boss, entry.drop))
+        return jobs
+
+    def autocomplete_storm(self):
+        jobs = []
+        for _ in range(self.n(300)):
+            entry = self.rng.choice(self.entries)
+            for i in range(1, len(entry.boss) + 1):
+                interaction = self.interaction("storm")
+                jobs.append(self.bot.boss_autocomplete(interaction, entry.boss[:i]))
+            for i in range(1, len(entry.drop) + 1):
+                interaction = self.interaction("storm", boss_name=entry.boss)
+                jobs.append(self.bot.drop_autocomplete(interaction, entry.drop[:i]))
+        return jobs
+
+    def team_stats_all(self):
+        return [
+            self.bot.team_stats_all.callback(self.interaction(self.rng.choice(self.members)[0]))
+            for _ in range(self.n(200))
+        ]
+
+    def hourly_loops(self):
+        jobs = self.team_stats_all()
+        for _ in range(self.n(5)):
+            jobs.append(self.bot.client.post_standings(self.event))
+        return jobs
+
+    def mixed(self):
+        return self.drop_burst() + self.autocomplete_storm() + self.hourly_loops()
+
+    async def run(self, scenario):
+        latencies = []
+        jobs = getattr(self, scenario)()
+        self.rng.shuffle(jobs)
+        with LoopProbe() as probe:
+            started_at = time.perf_counter()
+            await asyncio.gather(*(timed(latencies, job, started_at) for job in jobs))
+            elapsed = time.perf_counter() - started_at
+        latencies.sort()
+        lags = sorted(probe.lags) or [0.0]
+        return {
+            "ops": len(latencies),
+            "throughput": len(latencies) / elapsed,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000,
+            "loop_block_max_ms": lags[-1] * 1000,
+            "loop_block_total_ms": sum(lag for lag in lags if lag > 0.005) * 1000,
+        }
+
+async def run_all(loadtest, scenarios):
+    return {scenario: await loadtest.run(scenario) for scenario in scenarios}
+
+SCENARIOS = ["drop_burst", "autocomplete_storm", "team_stats_all", "hourly_loops", "mixed"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append", help="run only these scenarios")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the number of operations")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="fake network delay per send")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=2.0, help="allowed p99 slowdown vs the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    scenarios = args.scenario or SCENARIOS
+    with tempfile.TemporaryDirectory() as workdir:
+        bot = load_bot(workdir)
+        loadtest = LoadTest(bot, args.scale, args.delay_ms / 1000, random.Random(args.seed))
+        # One event loop for every scenario, like the bot's own
+        results = asyncio.run(run_all(loadtest, scenarios))
+        bot.events.default.storage.close()
+
+    print(f"{'scenario':<20}{'ops':>8}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'block max':>11}{'blocked':>10}")
+    for scenario, result in results.items():
+        print(
+            f"{scenario:<20}{result['ops']:>8}{result['throughput']:>10.0f}{result['p50_ms']:>10.3f}"
+            f"{result['p99_ms']:>10.3f}{result['loop_block_max_ms']:>11.3f}{result['loop_block_total_ms']:>10.1f}"
+        )
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump({scenario: {key: round(value, 3) for key, value in result.items()} for scenario, result in results.items()}, f, indent=4)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+
+    try:
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("No baseline to compare against; run with --update-baseline.")
+        return 0
+
+    regressions = []
+    for scenario, result in results.items():
+        expected = baseline.get(scenario)
+        # A 2ms floor keeps sub-millisecond scenarios from failing on scheduler noise
+        if expected and result["p99_ms"] > max(expected["p99_ms"] * args.tolerance, expected["p99_ms"] + 2.0):
+            regressions.append(f"{scenario}: p99 {result['p99_ms']:.3f}ms vs baseline {expected['p99_ms']:.3f}ms")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print("FAIL" if regressions else "OK")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Concurrent submission stress test.
+
+Fires thousands of simulated /drop and /remove_drop submissions at the
+submission pipeline at once, including retried (duplicate) interaction IDs,
+then checks that every team's total matches what /recalculate_points would
+compute from the drop counts and that retries were applied only once.
+
+    python benchmarks/stress_submissions.py [--submissions 5000] [--seed 1]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+
+from fake_discord import check_totals, load_bot
+
+async def stress(event, submissions, rng):
+    entries = list(event.drop_catalog.values())
+    teams = list(event.team_roster)
+    plan = []
+    for submission_id in range(submissions):
+        team = rng.choice(teams)
+        entry = rng.choice(entries)
+        kind = "remove" if rng.random() < 0.2 else "drop"
+        plan.append((submission_id, team, entry, kind))
+        if rng.random() < 0.1:
+            # Discord retrying the same interaction
+            plan.append((submission_id, team, entry, kind))
+    rng.shuffle(plan)
+
+    async def submit(submission_id, team, entry, kind):
+        await asyncio.sleep(rng.random() / 1000)
+        if kind == "drop":
+            return await event.submit_drop(submission_id, "stress", team, entry)
+        return await event.submit_removal(submission_id, "stress", team, entry)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(submit(*item) for item in plan))
+    elapsed = time.perf_counter() - start
+    return plan, results, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        event = load_bot(workdir).events.default
+        plan, results, elapsed = asyncio.run(stress(event, args.submissions, random.Random(args.seed)))
+        event.storage.close()
+
+    duplicates = sum(1 for result in results if result is not None and result.duplicate)
+    applied = sum(1 for result in results if result is not None and not result.duplicate)
+    print(f"{len(plan)} submissions ({duplicates} deduplicated retries, {applied} applied) in {elapsed * 1000:.1f}ms")
+
+    failures = check_totals(event)
+    applied_ids = [
+        submission_id
+        for (submission_id, *_), result in zip(plan, results)
+        if result is not None and not result.duplicate
+    ]
+    if len(applied_ids) != len(set(applied_ids)):
+        print("FAIL: a submission was applied more than once")
+        failures += 1
+
+    net_drops = sum(
+        1 if kind == "drop" else -1
+        for (_, _, _, kind), result in zip(plan, results)
+        if result is not None and not result.duplicate
+    )
+    counted = sum(
+        count
+        for bosses in event.team_drop_counts.values()
+        for drops in bosses.values()
+        for count in drops.values()
+    )
+    if counted != net_drops:
+        print(f"FAIL: {counted} drops counted but {net_drops} applied")
+        failures += 1
+    print("FAIL" if failures else "OK")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
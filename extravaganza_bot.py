@@ -1,19 +1,68 @@
+import time
+# Cold-start clock, started before the heavier imports below
+module_started_at = time.perf_counter()
 import os
+import sys
 from dotenv import load_dotenv
-import matplotlib.pyplot as plt
 import io
 import json
+import csv
+import copy
+import gzip
+import bisect
+import heapq
+from array import array
+import itertools
+import functools
+import hashlib
+import logging.handlers
+from collections import OrderedDict, deque, namedtuple
+from types import MappingProxyType
+import queue
+import threading
+import concurrent.futures
+import aiohttp
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
 load_dotenv()
 
 ADMINS = ["smacksmackk", "titaniumbutter", "dufwha", "iblametruth"]
 
+EVENT_LOG_FILE = "drop_events.jsonl"
+RECENT_EVENTS_FILE = "recent_events.jsonl"
+RECENT_EVENTS_HOURS = float(os.environ.get("RECENT_EVENTS_HOURS", "24"))  # how far back /recent_drops sees with JSON storage
+SNAPSHOT_FILE = "event_snapshot.json"
+ANNOUNCE_CHANNEL_ID = int(os.environ.get("ANNOUNCE_CHANNEL_ID", "1349758783827476583"))
+ANNOUNCE_INTERVAL_MINUTES = float(os.environ.get("ANNOUNCE_INTERVAL_MINUTES", "60"))
+ANNOUNCE_MIN_CHANGE = float(os.environ.get("ANNOUNCE_MIN_CHANGE", "0"))
+QUIET_HOURS = os.environ.get("QUIET_HOURS", "")  # e.g. "1-8", local time, end exclusive
+ANNOUNCEMENT_STATE_FILE = "announcement_state.json"
+POINTS_HISTORY_FILE = "points_history.json"
+HISTORY_BUCKET_MINUTES = int(os.environ.get("HISTORY_BUCKET_MINUTES", "5"))
+HISTORY_DAYS = float(os.environ.get("HISTORY_DAYS", "14"))
+GRAPH_MODE = os.environ.get("GRAPH_MODE", "bar")  # "bar" or "history" for the scheduled standings post
+COMMAND_TREE_FILE = "command_tree.json"
+EVENTS_DIR = os.environ.get("EVENTS_DIR", "events")
+EVENT_IDLE_MINUTES = float(os.environ.get("EVENT_IDLE_MINUTES", "60"))
+FORCE_TREE_SYNC = os.environ.get("FORCE_TREE_SYNC", "0") == "1"
+PENDING_FILE = "pending_drops.json"
+REQUIRE_APPROVAL = os.environ.get("REQUIRE_APPROVAL", "0") == "1"  # events can override in event.json
+REVIEW_PAGE_SIZE = 10
+APPROVALS_SAVE_SECONDS = 1.0  # queue changes within this long share one pending_drops.json write
+SNAPSHOTS_DIR = "snapshots"
+SNAPSHOT_INTERVAL_MINUTES = float(os.environ.get("SNAPSHOT_INTERVAL_MINUTES", "60"))
+SNAPSHOT_KEEP = int(os.environ.get("SNAPSHOT_KEEP", "168"))  # a week of hourly snapshots
+SCREENSHOT_DIR = "screenshots"
+SCREENSHOT_MAX_MB = float(os.environ.get("SCREENSHOT_MAX_MB", "8"))
+SCREENSHOT_STORE_MB = float(os.environ.get("SCREENSHOT_STORE_MB", "500"))  # per event, oldest unused evicted first
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9108"))
+
 team_colors = {
     "Team Armadyl": discord.Color(0x1045c1),
     "Team Bandos": discord.Color(0xda7614),
@@ -22,115 +71,1504 @@ team_colors = {
     "Team Zaros": discord.Color(0x4d0084),
 }
 
-with open("drops.json", "r", encoding="utf-8") as drops_file, open("team_roster.json", "r", encoding="utf-8") as roster_file:
-    boss_drops = json.load(drops_file)
-    team_roster = json.load(roster_file)
-
-def save_data():
-    with open("team_drop_counts.json", "w", encoding="utf-8") as f:
-        json.dump(team_drop_counts, f, indent=4)
-    with open("team_total_points.json", "w", encoding="utf-8") as f:
-        json.dump(team_total_points, f, indent=4)
-
-def load_data():
-    global team_drop_counts, team_total_points
+class Histogram:
+    """Prometheus-style cumulative histogram. Safe to observe from worker threads."""
+
+    BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (inf past the last bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+class Metrics:
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, label=None):
+        key = (name, label)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        histogram.observe(value)
+
+    def inc(self, name, label=None, amount=1):
+        with self._lock:
+            self.counters[(name, label)] = self.counters.get((name, label), 0) + amount
+
+    def gauge(self, name, fn):
+        """Register a callable that is read whenever metrics are exported."""
+        self.gauges[name] = fn
+
+    def render(self):
+        lines = []
+        for (name, label), histogram in sorted(self.histograms.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+            labels = f'command="{label}",' if label else ""
+            cumulative = 0
+            for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+                cumulative += count
+                lines.append(f'extravaganza_{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+            selector = f"{{{labels.rstrip(',')}}}" if label else ""
+            lines.append(f"extravaganza_{name}_sum{selector} {histogram.total}")
+            lines.append(f"extravaganza_{name}_count{selector} {histogram.count}")
+        for (name, label), value in sorted(self.counters.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+            selector = f'{{command="{label}"}}' if label else ""
+            lines.append(f"extravaganza_{name}{selector} {value}")
+        for name, fn in sorted(self.gauges.items()):
+            lines.append(f"extravaganza_{name} {fn()}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+startup_timings = {}
+for phase in ("import", "load_data", "tree_sync", "ready"):
+    metrics.gauge(f"startup_{phase}_seconds", functools.partial(startup_timings.get, phase, 0.0))
+
+def timed_autocomplete(fn):
+    @functools.wraps(fn)
+    async def wrapper(interaction, current):
+        started_at = time.perf_counter()
+        try:
+            return await fn(interaction, current)
+        finally:
+            metrics.observe("autocomplete_seconds", time.perf_counter() - started_at, fn.__name__)
+    return wrapper
+
+CatalogEntry = namedtuple("CatalogEntry", ["boss", "drop", "points", "full_value_count", "duplicate_multiplier"])
+
+def normalize_drop(drop_name):
+    return " ".join(drop_name.lower().split())
+
+def compile_catalog(boss_drops):
+    # Drops are worth full points for the first full_value_count, then points * duplicate_multiplier
+    catalog = {}
+    for boss_name, drops in boss_drops.items():
+        for drop in drops:
+            catalog[(boss_name, normalize_drop(drop["drop"]))] = CatalogEntry(
+                boss_name,
+                drop["drop"],
+                drop["points"],
+                drop.get("full_value_count", 1),
+                drop.get("duplicate_multiplier", 0.5),
+            )
+    return MappingProxyType(catalog)
+
+def drop_points(entry, nth):
+    """Points awarded for the nth (1-based) copy of a drop."""
+    if nth <= entry.full_value_count:
+        return entry.points
+    return entry.points * entry.duplicate_multiplier
+
+def total_drop_points(entry, count):
+    full = min(count, entry.full_value_count)
+    return full * entry.points + (count - full) * entry.points * entry.duplicate_multiplier
+
+class ScoringEngine:
+    """Scores every team at once from a dense team x drop count matrix."""
+
+    def __init__(self, catalog):
+        import numpy as np
+
+        self.np = np
+        self.keys = list(catalog)
+        self.columns = {key: i for i, key in enumerate(self.keys)}
+        entries = [catalog[key] for key in self.keys]
+        # Drop counts are stored under the catalog's spelling, so most lookups skip normalizing
+        self.boss_columns = {}
+        for i, entry in enumerate(entries):
+            self.boss_columns.setdefault(entry.boss, {})[entry.drop] = i
+        self.points = np.array([entry.points for entry in entries], dtype=float)
+        self.full_value_count = np.array([entry.full_value_count for entry in entries], dtype=float)
+        self.duplicate_points = self.points * np.array([entry.duplicate_multiplier for entry in entries], dtype=float)
+
+    def count_matrix(self, drop_counts, teams):
+        """Returns the count matrix and how many counted drops aren't in the catalog."""
+        width = len(self.keys)
+        cells, values = [], []
+        unmatched = 0
+        for row, team in enumerate(teams):
+            offset = row * width
+            for boss_name, drops in drop_counts.get(team, {}).items():
+                boss_columns = self.boss_columns.get(boss_name, {})
+                for drop_name, count in drops.items():
+                    column = boss_columns.get(drop_name)
+                    if column is None:
+                        column = self.columns.get((boss_name, normalize_drop(drop_name)))
+                    if column is None:
+                        unmatched += count
+                        continue
+                    cells.append(offset + column)
+                    values.append(count)
+        np = self.np
+        counts = np.bincount(
+            np.array(cells, dtype=np.int64),
+            weights=np.array(values, dtype=float),
+            minlength=len(teams) * width,
+        )
+        return counts.reshape(len(teams), width), unmatched
+
+    def totals(self, counts):
+        full = self.np.minimum(counts, self.full_value_count)
+        return full @ self.points + (counts - full) @ self.duplicate_points
+
+    def team_points(self, drop_counts, teams=None):
+        teams = list(teams if teams is not None else drop_counts)
+        counts, _ = self.count_matrix(drop_counts, teams)
+        return {team: float(total) for team, total in zip(teams, self.totals(counts))}
+
+def display_points(points):
+    return int(points) if float(points).is_integer() else points
+
+def ordinal(n):
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+class Leaderboard:
+    """Scores kept in ranked order and updated in place, so rank and gap reads are O(1)."""
+
+    def __init__(self, scores=None):
+        self._announced = {}
+        self._announced_scores = {}
+        self.reset(scores or {})
+
+    def reset(self, scores):
+        # The last announcement is kept so a reset or recalculate still shows up as a change
+        self._scores = dict(scores)
+        # sorted() is stable, so ties keep their insertion order like the old per-call sorts
+        self._order = sorted(self._scores, key=self._scores.get, reverse=True)
+        self._ranks = {key: i for i, key in enumerate(self._order)}
+
+    def update(self, key, score):
+        if key not in self._scores:
+            self._scores[key] = score
+            self._ranks[key] = len(self._order)
+            self._order.append(key)
+        self._scores[key] = score
+        i = self._ranks[key]
+        # Drops move a score a little, so bubbling past neighbours beats a full re-sort
+        while i > 0 and score > self._scores[self._order[i - 1]]:
+            self._swap(i, i - 1)
+            i -= 1
+        while i < len(self._order) - 1 and score < self._scores[self._order[i + 1]]:
+            self._swap(i, i + 1)
+            i += 1
+
+    def _swap(self, i, j):
+        order = self._order
+        order[i], order[j] = order[j], order[i]
+        self._ranks[order[i]] = i
+        self._ranks[order[j]] = j
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, key):
+        return key in self._ranks
+
+    def score(self, key):
+        return self._scores.get(key, 0)
+
+    def rank(self, key):
+        """1-based rank of key."""
+        return self._ranks[key] + 1
+
+    def at(self, rank):
+        key = self._order[rank - 1]
+        return key, self._scores[key]
+
+    def top(self, n=None):
+        keys = self._order if n is None else self._order[:n]
+        return [(key, self._scores[key]) for key in keys]
+
+    def gap_above(self, key):
+        i = self._ranks[key]
+        if i == 0:
+            return None
+        above = self._order[i - 1]
+        return above, self._scores[above] - self._scores[key]
+
+    def rank_change(self, key):
+        """Places gained (positive) or lost since the last mark_announced()."""
+        previous = self._announced.get(key)
+        if previous is None:
+            return 0
+        return previous - self._ranks[key]
+
+    def changed_since_announced(self, threshold=0):
+        """True if any rank flipped or any score moved more than threshold since the last mark_announced()."""
+        for key, score in self._scores.items():
+            if key not in self._announced_scores or self._announced[key] != self._ranks[key]:
+                return True
+            if abs(score - self._announced_scores[key]) > threshold:
+                return True
+        return len(self._announced_scores) != len(self._scores)
+
+    def mark_announced(self):
+        self._announced = dict(self._ranks)
+        self._announced_scores = dict(self._scores)
+
+class PointsHistory:
+    """Per-team cumulative points in fixed-width time buckets.
+
+    Each team's series is an array('d') used as a ring of `capacity` buckets, so
+    memory stays fixed however long the event runs; only the newest buckets are kept.
+    """
+
+    def __init__(self, bucket_seconds=HISTORY_BUCKET_MINUTES * 60, capacity=int(HISTORY_DAYS * 86400 // (HISTORY_BUCKET_MINUTES * 60))):
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self):
+        self._series = {}
+        self._first = None
+        self._last = None
+
+    def _advance(self, bucket):
+        if self._last is None:
+            self._first = self._last = bucket
+            return
+        if bucket <= self._last:
+            return
+        # Carry every team's total forward through the buckets nothing happened in
+        start = max(self._last + 1, bucket - self.capacity + 1)
+        for series in self._series.values():
+            carried = series[self._last % self.capacity]
+            for b in range(start, bucket + 1):
+                series[b % self.capacity] = carried
+        self._last = bucket
+        self._first = max(self._first, bucket - self.capacity + 1)
+
+    def record(self, team, total, now=None):
+        bucket = int((time.time() if now is None else now) // self.bucket_seconds)
+        self._advance(bucket)
+        series = self._series.get(team)
+        if series is None:
+            series = self._series[team] = array("d", bytes(8 * self.capacity))
+        series[max(bucket, self._last) % self.capacity] = total
+
+    def series(self, since=None, max_points=600):
+        """(timestamps, {team: totals}) from since onwards, downsampled to at most max_points buckets."""
+        if self._last is None:
+            return [], {}
+        first = self._first if since is None else max(self._first, int(since // self.bucket_seconds))
+        stride = max(1, -(-(self._last - first + 1) // max_points))
+        # Step back from the newest bucket so the chart always ends on the current totals
+        buckets = range(self._last, first - 1, -stride)[::-1]
+        timestamps = [b * self.bucket_seconds for b in buckets]
+        return timestamps, {
+            team: [series[b % self.capacity] for b in buckets]
+            for team, series in self._series.items()
+        }
+
+    def copy(self):
+        """A detached copy. Each series is duplicated with one memcpy, so this is cheap on the event loop."""
+        clone = PointsHistory(self.bucket_seconds, self.capacity)
+        clone._series = {team: series[:] for team, series in self._series.items()}
+        clone._first, clone._last = self._first, self._last
+        return clone
+
+    def to_dict(self):
+        _, series = self.series(max_points=self.capacity)
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "first": self._first,
+            "last": self._last,
+            "series": {team: values for team, values in series.items()},
+        }
+
+    def load(self, data):
+        self.clear()
+        if data.get("bucket_seconds") != self.bucket_seconds or data.get("last") is None:
+            return
+        first = max(data["first"], data["last"] - self.capacity + 1)
+        offset = first - data["first"]
+        self._first, self._last = first, data["last"]
+        for team, values in data["series"].items():
+            series = self._series[team] = array("d", bytes(8 * self.capacity))
+            for b, value in enumerate(values[offset:], start=first):
+                series[b % self.capacity] = value
+
+RosterMember = namedtuple("RosterMember", ["team", "role", "ign"])
+
+def build_roster_index(roster):
+    return {
+        member["discord_user"]: RosterMember(team, member["role"], member["ign"])
+        for team, members in roster.items()
+        for member in members
+    }
+
+def write_json_atomic(path, data, indent=None):
+    # Write to a temp file and swap it in so a crash never leaves a truncated file behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def write_text_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class BatchWorker:
+    """Runs storage jobs in order on one background thread, committing once per batch."""
+
+    def __init__(self, name, batch_size=256):
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args):
+        future = concurrent.futures.Future()
+        self._queue.put((fn, args, future))
+        return future
+
+    async def run(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _open(self):
+        pass
+
+    def _commit(self):
+        pass
+
+    def _close(self):
+        pass
+
+    def _run(self):
+        self._open()
+        while True:
+            jobs = [self._queue.get()]
+            while len(jobs) < self.batch_size:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            results = []
+            started_at = time.perf_counter()
+            for job in jobs:
+                if job is None:
+                    stop = True
+                    continue
+                fn, args, future = job
+                try:
+                    results.append((future, fn(*args), None))
+                except Exception as e:
+                    logging.error(f"Storage job {fn.__name__} failed: {e}")
+                    results.append((future, None, e))
+            commit_error = None
+            try:
+                self._commit()
+            except Exception as e:
+                logging.error(f"Storage commit failed: {e}")
+                commit_error = e
+            metrics.observe("storage_batch_seconds", time.perf_counter() - started_at)
+            # Only report success once the batch is durable
+            for future, result, error in results:
+                error = error or commit_error
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            for _ in jobs:
+                self._queue.task_done()
+            if stop:
+                self._close()
+                return
+
+def make_event(kind, user, team, boss_name, drop_name, points, player=None, ign=None):
+    # user is who ran the command, player is who the drop is credited to
+    return {
+        "type": kind,
+        "user": user,
+        "player": player,
+        "ign": ign,
+        "team": team,
+        "boss": boss_name,
+        "drop": drop_name,
+        "points": points,
+        "ts": datetime.now().isoformat(timespec="seconds"),
+    }
+
+def apply_event(drop_counts, total_points, contributors, record):
+    team = record["team"]
+    boss_name = record["boss"]
+    drop_name = record["drop"]
+    team_drops = drop_counts.setdefault(team, {})
+    if record["type"] == "drop":
+        boss_counts = team_drops.setdefault(boss_name, {})
+        boss_counts[drop_name] = boss_counts.get(drop_name, 0) + 1
+        total_points[team] = total_points.get(team, 0) + record["points"]
+        push_contributor(contributors, team, boss_name, drop_name, record.get("player"))
+    elif record["type"] == "remove":
+        boss_counts = team_drops.get(boss_name, {})
+        if boss_counts.get(drop_name, 0) > 0:
+            boss_counts[drop_name] -= 1
+            if boss_counts[drop_name] == 0:
+                del boss_counts[drop_name]
+                if not boss_counts:
+                    del team_drops[boss_name]
+        total_points[team] = total_points.get(team, 0) - record["points"]
+        pop_contributor(contributors, team, boss_name, drop_name)
+
+def push_contributor(contributors, team, boss_name, drop_name, player):
+    contributors.setdefault(team, {}).setdefault(boss_name, {}).setdefault(drop_name, []).append(player)
+
+def pop_contributor(contributors, team, boss_name, drop_name):
+    """Remove and return the player credited with the team's latest copy of a drop."""
+    team_drops = contributors.get(team, {})
+    players = team_drops.get(boss_name, {}).get(drop_name)
+    if not players:
+        return None
+    player = players.pop()
+    if not players:
+        del team_drops[boss_name][drop_name]
+        if not team_drops[boss_name]:
+            del team_drops[boss_name]
+    return player
+
+def load_legacy_json(directory="."):
     try:
-        with open("team_drop_counts.json", "r", encoding="utf-8") as f:
-            team_drop_counts = json.load(f)
-        with open("team_total_points.json", "r", encoding="utf-8") as f:
-            team_total_points = json.load(f)
+        with open(os.path.join(directory, "team_drop_counts.json"), "r", encoding="utf-8") as f:
+            drop_counts = json.load(f)
+        with open(os.path.join(directory, "team_total_points.json"), "r", encoding="utf-8") as f:
+            total_points = json.load(f)
     except FileNotFoundError:
-        team_drop_counts = {team: {} for team in team_roster}
-        team_total_points = {team: 0 for team in team_roster}
+        return None
+    return drop_counts, total_points
+
+class JsonStorage(BatchWorker):
+    """Append-only event journal plus a periodically compacted JSON snapshot.
+
+    Compaction moves the journal's records into a recent-events file that keeps
+    RECENT_EVENTS_HOURS of them, so recent_events() can see past the last compaction.
+    """
+
+    history_hours = RECENT_EVENTS_HOURS
+
+    def __init__(self, directory="."):
+        self.directory = directory
+        self.path = os.path.join(directory, EVENT_LOG_FILE)
+        self.recent_path = os.path.join(directory, RECENT_EVENTS_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.seq = 0
+        super().__init__(f"json-storage:{directory}")
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _commit(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _close(self):
+        self._file.close()
+
+    def load(self):
+        self.flush()
+        seq = 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            seq = snapshot["seq"]
+            drop_counts = snapshot["team_drop_counts"]
+            total_points = snapshot["team_total_points"]
+            contributors = snapshot.get("drop_contributors", {})
+        except FileNotFoundError:
+            drop_counts, total_points = load_legacy_json(self.directory) or ({}, {})
+            contributors = {}
+
+        for record in self._read_events(None):
+            if record["seq"] <= seq:
+                continue
+            apply_event(drop_counts, total_points, contributors, record)
+            seq = record["seq"]
+        self.seq = seq
+        return drop_counts, total_points, contributors
+
+    def record_event(self, record):
+        self.seq += 1
+        self.submit(self._append, {"seq": self.seq, **record})
+
+    def record_drops(self, records):
+        """record_event for a batch of drops, written in one go."""
+        first = self.seq + 1
+        self.seq += len(records)
+        self.submit(self._append_many, first, records)
+
+    def save_state(self, drop_counts, total_points, contributors):
+        # Callers hand over state they won't change until the returned future is done (see Event.share_state)
+        state = {
+            "seq": self.seq,
+            "team_drop_counts": drop_counts,
+            "team_total_points": dict(total_points),
+            "drop_contributors": contributors,
+        }
+        return self.submit(self._write_snapshot, state)
+
+    def compact(self, drop_counts, total_points, contributors):
+        # Folds the journal into a fresh snapshot so it stops growing
+        return self.save_state(drop_counts, total_points, contributors)
+
+    async def recent_events(self, since):
+        return await self.run(self._read_recent, since)
+
+    def _read_recent(self, since):
+        # Appends from earlier in this batch are still in the file buffer
+        self._file.flush()
+        return self._read_events(since, self.recent_path) + self._read_events(since)
+
+    def _append(self, record):
+        self._file.write(json.dumps(record) + "\n")
+
+    def _append_many(self, first, records):
+        self._file.write("".join(json.dumps({"seq": seq, **record}) + "\n" for seq, record in enumerate(records, start=first)))
+
+    def _write_snapshot(self, state):
+        started_at = time.perf_counter()
+        self._commit()
+        write_json_atomic(self.snapshot_path, state)
+        self._archive_journal()
+        # Every record written so far is covered by the snapshot, so the journal can start over
+        self._file.truncate(0)
+        # Human-readable copies, kept for anything still reading the old files
+        write_json_atomic(os.path.join(self.directory, "team_drop_counts.json"), state["team_drop_counts"], indent=4)
+        write_json_atomic(os.path.join(self.directory, "team_total_points.json"), state["team_total_points"], indent=4)
+        metrics.observe("save_data_seconds", time.perf_counter() - started_at)
+
+    def _archive_journal(self):
+        """Move the journal's records to the recent-events file, dropping ones older than RECENT_EVENTS_HOURS."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            journal = f.read()
+        try:
+            with open(self.recent_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            lines = []
+        cutoff = (datetime.now() - timedelta(hours=self.history_hours)).isoformat(timespec="seconds")
+        # Records are in time order, so only the expired ones at the front need parsing
+        expired = 0
+        for line in lines:
+            try:
+                if json.loads(line)["ts"] >= cutoff:
+                    break
+            except (json.JSONDecodeError, KeyError):
+                pass
+            expired += 1
+        if expired:
+            write_text_atomic(self.recent_path, "".join(lines[expired:]) + journal)
+        elif journal:
+            with open(self.recent_path, "a", encoding="utf-8") as f:
+                f.write(journal)
+
+    def _read_events(self, since, path=None):
+        records = []
+        try:
+            with open(path or self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-write
+                        logging.warning("Skipping unreadable event journal line.")
+                        continue
+                    if since is None or record["ts"] >= since:
+                        records.append(record)
+        except FileNotFoundError:
+            pass
+        return records
+
+class SqliteStorage(BatchWorker):
+    """WAL-mode SQLite with a drop history table and materialized counts and totals."""
+
+    # The drops table keeps every event
+    history_hours = None
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS drops (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            team TEXT NOT NULL,
+            boss TEXT NOT NULL,
+            drop_name TEXT NOT NULL,
+            user TEXT,
+            player TEXT,
+            ign TEXT,
+            points REAL NOT NULL,
+            ts TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS drops_team_boss_drop ON drops (team, boss, drop_name);
+        CREATE INDEX IF NOT EXISTS drops_ts ON drops (ts);
+        CREATE INDEX IF NOT EXISTS drops_user ON drops (user);
+        CREATE TABLE IF NOT EXISTS drop_counts (
+            team TEXT NOT NULL,
+            boss TEXT NOT NULL,
+            drop_name TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (team, boss, drop_name)
+        );
+        CREATE TABLE IF NOT EXISTS team_totals (
+            team TEXT PRIMARY KEY,
+            points REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS drop_contributors (
+            team TEXT NOT NULL,
+            boss TEXT NOT NULL,
+            drop_name TEXT NOT NULL,
+            nth INTEGER NOT NULL,
+            player TEXT,
+            PRIMARY KEY (team, boss, drop_name, nth)
+        );
+    """
+
+    INSERT_DROP = "INSERT INTO drops (type, team, boss, drop_name, user, player, ign, points, ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+    def __init__(self, path="extravaganza.db", directory="."):
+        self.path = path
+        self.directory = directory
+        super().__init__(f"sqlite-storage:{path}")
+
+    def _open(self):
+        import sqlite3
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        # Databases created before per-player attribution lack drops.player and drops.ign
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(drops)")}
+        for column in ("player", "ign"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE drops ADD COLUMN {column} TEXT")
+        self._conn.commit()
+
+    def _commit(self):
+        self._conn.commit()
+
+    def _close(self):
+        self._conn.close()
+
+    def load(self):
+        drop_counts, total_points, contributors = self.submit(self._load).result()
+        if not total_points:
+            legacy = load_legacy_json(self.directory)
+            if legacy:
+                # First run against an empty database: seed it from the JSON files. Wait for it,
+                # since save_state doesn't copy and the caller is about to start changing this state
+                drop_counts, total_points = legacy
+                self.save_state(drop_counts, total_points, contributors).result()
+        return drop_counts, total_points, contributors
+
+    def record_event(self, record):
+        self.submit(self._insert, record)
+
+    def record_drops(self, records):
+        self.submit(self._insert_drops, records)
+
+    def save_state(self, drop_counts, total_points, contributors):
+        return self.submit(self._replace_state, drop_counts, dict(total_points), contributors)
+
+    def compact(self, drop_counts, total_points, contributors):
+        # _insert keeps the materialized tables current, so there is nothing to fold in
+        return None
+
+    async def recent_events(self, since):
+        return await self.run(self._read_events, since)
+
+    def _load(self):
+        drop_counts = {}
+        for team, boss_name, drop_name, count in self._conn.execute("SELECT team, boss, drop_name, count FROM drop_counts ORDER BY rowid"):
+            drop_counts.setdefault(team, {}).setdefault(boss_name, {})[drop_name] = count
+        total_points = dict(self._conn.execute("SELECT team, points FROM team_totals ORDER BY rowid"))
+        contributors = {}
+        for team, boss_name, drop_name, nth, player in self._conn.execute(
+            "SELECT team, boss, drop_name, nth, player FROM drop_contributors ORDER BY team, boss, drop_name, nth"
+        ):
+            players = contributors.setdefault(team, {}).setdefault(boss_name, {}).setdefault(drop_name, [])
+            # Drops counted before attribution existed have no rows; keep later ones at their position
+            players.extend([None] * (nth - 1 - len(players)))
+            players.append(player)
+        return drop_counts, total_points, contributors
+
+    def _insert(self, record):
+        delta = 1 if record["type"] == "drop" else -1
+        points = record["points"] * delta
+        key = (record["team"], record["boss"], record["drop"])
+        self._conn.execute(
+            self.INSERT_DROP,
+            (record["type"], *key, record["user"], record.get("player"), record.get("ign"), record["points"], record["ts"]),
+        )
+        if delta < 0:
+            self._conn.execute(
+                "DELETE FROM drop_contributors WHERE team = ? AND boss = ? AND drop_name = ? AND nth = "
+                "(SELECT count FROM drop_counts WHERE team = ? AND boss = ? AND drop_name = ?)",
+                key + key,
+            )
+        self._conn.execute(
+            "INSERT INTO drop_counts (team, boss, drop_name, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (team, boss, drop_name) DO UPDATE SET count = count + excluded.count",
+            (*key, delta),
+        )
+        if delta > 0:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO drop_contributors (team, boss, drop_name, nth, player) "
+                "SELECT team, boss, drop_name, count, ? FROM drop_counts WHERE team = ? AND boss = ? AND drop_name = ?",
+                (record.get("player"), *key),
+            )
+        self._conn.execute("DELETE FROM drop_counts WHERE team = ? AND boss = ? AND drop_name = ? AND count <= 0",
+                           (record["team"], record["boss"], record["drop"]))
+        self._conn.execute(
+            "INSERT INTO team_totals (team, points) VALUES (?, ?) "
+            "ON CONFLICT (team) DO UPDATE SET points = points + excluded.points",
+            (record["team"], points),
+        )
+
+    def _insert_drops(self, records):
+        """_insert for a batch of drops, with one statement per table rather than per drop where possible."""
+        self._conn.executemany(self.INSERT_DROP, [
+            (record["type"], record["team"], record["boss"], record["drop"], record["user"],
+             record.get("player"), record.get("ign"), record["points"], record["ts"])
+            for record in records
+        ])
+        copies, points = {}, {}
+        for record in records:
+            copies.setdefault((record["team"], record["boss"], record["drop"]), []).append(record.get("player"))
+            points[record["team"]] = points.get(record["team"], 0) + record["points"]
+        for key, players in copies.items():
+            row = self._conn.execute("SELECT count FROM drop_counts WHERE team = ? AND boss = ? AND drop_name = ?", key).fetchone()
+            before = row[0] if row else 0
+            self._conn.execute(
+                "INSERT INTO drop_counts (team, boss, drop_name, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (team, boss, drop_name) DO UPDATE SET count = count + excluded.count",
+                (*key, len(players)),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO drop_contributors (team, boss, drop_name, nth, player) VALUES (?, ?, ?, ?, ?)",
+                [(*key, nth, player) for nth, player in enumerate(players, start=before + 1)],
+            )
+        self._conn.executemany(
+            "INSERT INTO team_totals (team, points) VALUES (?, ?) "
+            "ON CONFLICT (team) DO UPDATE SET points = points + excluded.points",
+            list(points.items()),
+        )
+
+    def _replace_state(self, drop_counts, total_points, contributors):
+        started_at = time.perf_counter()
+        self._conn.execute("DELETE FROM drop_counts")
+        self._conn.execute("DELETE FROM team_totals")
+        self._conn.execute("DELETE FROM drop_contributors")
+        self._conn.executemany(
+            "INSERT INTO drop_counts (team, boss, drop_name, count) VALUES (?, ?, ?, ?)",
+            [
+                (team, boss_name, drop_name, count)
+                for team, bosses in drop_counts.items()
+                for boss_name, drops in bosses.items()
+                for drop_name, count in drops.items()
+            ],
+        )
+        self._conn.executemany("INSERT INTO team_totals (team, points) VALUES (?, ?)", total_points.items())
+        self._conn.executemany(
+            "INSERT INTO drop_contributors (team, boss, drop_name, nth, player) VALUES (?, ?, ?, ?, ?)",
+            [
+                (team, boss_name, drop_name, nth, player)
+                for team, bosses in contributors.items()
+                for boss_name, drops in bosses.items()
+                for drop_name, players in drops.items()
+                for nth, player in enumerate(players, start=1)
+            ],
+        )
+        metrics.observe("save_data_seconds", time.perf_counter() - started_at)
+
+    def _read_events(self, since):
+        query = "SELECT type, user, player, ign, team, boss, drop_name, points, ts FROM drops"
+        params = ()
+        if since is not None:
+            query += " WHERE ts >= ?"
+            params = (since,)
+        return [
+            {"type": kind, "user": user, "player": player, "ign": ign, "team": team, "boss": boss_name, "drop": drop_name, "points": points, "ts": ts}
+            for kind, user, player, ign, team, boss_name, drop_name, points, ts in self._conn.execute(query + " ORDER BY id", params)
+        ]
+
+def open_storage(directory=".", backend=None, path=None):
+    backend = (backend or os.environ.get("STORAGE_BACKEND", "json")).lower()
+    if backend == "sqlite":
+        return SqliteStorage(path or os.path.join(directory, "extravaganza.db"), directory)
+    return JsonStorage(directory)
+
+INTERACTIVE = 0
+SCHEDULED = 1
+
+def chunk_embeds(embeds, max_embeds=10, max_chars=6000):
+    """Split embeds into batches that fit in one message."""
+    batches = []
+    batch = []
+    batch_chars = 0
+    for embed in embeds:
+        if batch and (len(batch) >= max_embeds or batch_chars + len(embed) > max_chars):
+            batches.append(batch)
+            batch = []
+            batch_chars = 0
+        batch.append(embed)
+        batch_chars += len(embed)
+    if batch:
+        batches.append(batch)
+    return batches
+
+class RateLimitBucket:
+    """Allows at most `rate` sends per `per` seconds on one route."""
+
+    def __init__(self, rate=5, per=5.0):
+        self.rate = rate
+        self.per = per
+        self._sent_at = deque(maxlen=rate)
+
+    async def acquire(self):
+        if len(self._sent_at) == self.rate:
+            wait = self.per - (time.monotonic() - self._sent_at[0])
+            if wait > 0:
+                await asyncio.sleep(wait)
+        self._sent_at.append(time.monotonic())
+
+class OutboundDispatcher:
+    """Per-route outbound queue that coalesces embeds and paces sends to Discord's rate limits.
+
+    Each channel or interaction webhook gets its own queue and worker. Interaction
+    traffic (INTERACTIVE) is sent ahead of scheduled posts (SCHEDULED) on the same route.
+    """
+
+    def __init__(self, rate=5, per=5.0, idle_timeout=60.0, max_retries=3):
+        self.rate = rate
+        self.per = per
+        self.idle_timeout = idle_timeout
+        self.max_retries = max_retries
+        self._queues = {}
+        self._wakeups = {}
+        self._workers = {}
+        self._buckets = {}
+        self._seq = itertools.count()
+        self.latencies = deque(maxlen=1000)
+        self.sent = 0
+        self.rate_limited = 0
+
+    @staticmethod
+    def route_key(target):
+        if isinstance(target, discord.Webhook):
+            return ("webhook", target.id, target.token)
+        return ("channel", getattr(target, "id", id(target)))
+
+    async def send(self, target, content=None, *, embeds=None, file=None, priority=SCHEDULED):
+        """Queue a message and wait until it has been sent. Returns the sent message(s)."""
+        key = self.route_key(target)
+        heap = self._queues.setdefault(key, [])
+        loop = asyncio.get_running_loop()
+        futures = []
+        for i, batch in enumerate(chunk_embeds(embeds) if embeds else [None]):
+            payload = {}
+            if i == 0 and content is not None:
+                payload["content"] = content
+            if i == 0 and file is not None:
+                payload["file"] = file
+            if batch:
+                payload["embeds"] = batch
+            future = loop.create_future()
+            heapq.heappush(heap, (priority, next(self._seq), time.perf_counter(), target, payload, [future]))
+            futures.append(future)
+
+        self._wakeups.setdefault(key, asyncio.Event()).set()
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.create_task(self._run(key))
+        return await asyncio.gather(*futures)
+
+    def queue_depth(self):
+        return sum(len(heap) for heap in self._queues.values())
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        return {
+            "queue_depth": self.queue_depth(),
+            "routes": len(self._workers),
+            "sent": self.sent,
+            "rate_limited": self.rate_limited,
+            "latency_p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+            "latency_p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else 0.0,
+        }
+
+    @staticmethod
+    def _can_merge(payload, other):
+        # Only plain embed messages are coalesced; content and files keep their own message
+        if set(payload) != {"embeds"} or set(other) != {"embeds"}:
+            return False
+        if len(payload["embeds"]) + len(other["embeds"]) > 10:
+            return False
+        return sum(len(e) for e in payload["embeds"]) + sum(len(e) for e in other["embeds"]) <= 6000
+
+    async def _run(self, key):
+        heap = self._queues[key]
+        wakeup = self._wakeups[key]
+        bucket = self._buckets.setdefault(key, RateLimitBucket(self.rate, self.per))
+        while True:
+            if not heap:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if not heap:
+                        # Idle routes (mostly one-off interaction webhooks) release everything they hold,
+                        # token included; send() sets them up again if the route comes back
+                        self._workers.pop(key, None)
+                        self._buckets.pop(key, None)
+                        self._queues.pop(key, None)
+                        self._wakeups.pop(key, None)
+                        return
+                continue
+
+            priority, _, queued_at, target, payload, futures = heapq.heappop(heap)
+            enqueued = [queued_at]
+            while heap and heap[0][0] == priority and self._can_merge(payload, heap[0][4]):
+                _, _, other_queued_at, _, other, other_futures = heapq.heappop(heap)
+                payload = {"embeds": payload["embeds"] + other["embeds"]}
+                futures += other_futures
+                enqueued.append(other_queued_at)
+
+            await bucket.acquire()
+            try:
+                message = await self._deliver(target, payload)
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            sent_at = time.perf_counter()
+            self.sent += 1
+            self.latencies.extend(sent_at - t for t in enqueued)
+            for t in enqueued:
+                metrics.observe("outbound_wait_seconds", sent_at - t)
+            for future in futures:
+                if not future.done():
+                    future.set_result(message)
+
+    async def _deliver(self, target, payload):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await target.send(**payload)
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == self.max_retries:
+                    raise
+                self.rate_limited += 1
+                metrics.inc("rate_limited_total")
+                retry_after = getattr(e, "retry_after", None) or 1.0
+                logging.warning(f"Rate limited sending to {self.route_key(target)}, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+
+outbound = OutboundDispatcher()
+metrics.gauge("outbound_queue_depth", outbound.queue_depth)
+
+def leaderboard_embeds(event):
+    leaderboard = event.team_leaderboard
+    embeds = []
+    for rank, (team, points) in enumerate(leaderboard.top(), start=1):
+        description = f"**{team}:** {display_points(points)} points"
+        change = leaderboard.rank_change(team)
+        if change:
+            description += f" ({'▲' if change > 0 else '▼'}{abs(change)})"
+        gap = leaderboard.gap_above(team)
+        if gap:
+            description += f"\n{display_points(gap[1])} behind {gap[0]}"
+        embeds.append(discord.Embed(description=description, color=event.team_color(team)))
+    return embeds
+
+def render_leaderboard_png(teams, points, colors):
+    # Runs in a worker thread: the OO Figure API with an Agg canvas keeps clear of pyplot's global state
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.barh(teams, points, color=colors)
+    ax.set_xlabel("Total Points")
+    ax.set_title("Team Points Leaderboard")
+    fig.subplots_adjust(left=0.2)  # Adjust the left margin
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+def render_points_history_png(timestamps, series, colors):
+    # Worker thread, like render_leaderboard_png
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    import matplotlib.dates as mdates
+
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    times = [datetime.fromtimestamp(ts) for ts in timestamps]
+    for team, values in series.items():
+        ax.plot(times, values, color=colors[team], linewidth=2, label=team)
+        if values:
+            ax.annotate(display_points(values[-1]), (times[-1], values[-1]), xytext=(4, 0),
+                        textcoords="offset points", va="center", color=colors[team])
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %d %H:%M"))
+    fig.autofmt_xdate()
+    ax.set_ylabel("Total Points")
+    ax.set_title("Team Points Over Time")
+    ax.legend(loc="upper left")
+    ax.grid(alpha=0.3)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+async def points_history_png(event, hours=None):
+    """PNG of each team's points over the last `hours` (the whole history if None), or None if there's no history."""
+    since = time.time() - hours * 3600 if hours else None
+    timestamps, series = event.points_history.series(since)
+    if len(timestamps) < 2:
+        return None
+    # Legend in current standings order
+    series = {team: series[team] for team, _ in event.team_leaderboard.top() if team in series}
+    colors = {team: tuple(c / 255 for c in event.team_color(team).to_rgb()) for team in series}
+    return await asyncio.to_thread(render_points_history_png, timestamps, series, colors)
+
+async def leaderboard_png(event):
+    """PNG bytes of the event's current standings, re-rendered only when the scores change."""
+    graph_cache = event.graph_cache
+    # Lowest score first so barh draws the leader at the top
+    sorted_teams_points = event.team_leaderboard.top()[::-1]
+    key = hash(tuple(sorted_teams_points))
+    if graph_cache["key"] == key and graph_cache["png"] is not None:
+        return graph_cache["png"]
+
+    if graph_cache["key"] != key or graph_cache["task"] is None:
+        teams = [item[0] for item in sorted_teams_points]
+        points = [item[1] for item in sorted_teams_points]
+        colors = [tuple(c / 255 for c in event.team_color(team).to_rgb()) for team in teams]
+        # Concurrent callers for the same scores share one render
+        graph_cache.update(key=key, png=None, task=asyncio.ensure_future(
+            asyncio.to_thread(render_leaderboard_png, teams, points, colors)
+        ))
+
+    task = graph_cache["task"]
+    try:
+        png = await asyncio.shield(task)
+    except Exception:
+        if graph_cache["task"] is task:
+            graph_cache.update(key=None, png=None, task=None)
+        raise
+    if graph_cache["task"] is task:
+        graph_cache.update(png=png, task=None)
+    return png
+
+class MetricsCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras["started_at"] = time.perf_counter()
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        command_name = interaction.command.qualified_name if interaction.command else "unknown"
+        metrics.inc("command_errors_total", command_name)
+        await super().on_error(interaction, error)
+
+loop_lag = {"last": 0.0}
+
+async def monitor_loop_lag(interval=0.5):
+    # A sleep that wakes late means something held the event loop
+    while True:
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(time.perf_counter() - started_at - interval, 0.0)
+        loop_lag["last"] = lag
+        metrics.observe("event_loop_lag_seconds", lag)
+
+metrics.gauge("event_loop_lag_last_seconds", lambda: loop_lag["last"])
+
+async def start_metrics_server():
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(text=metrics.render(), content_type="text/plain")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    logging.info(f"Serving metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    return runner
 
 class MyClient(commands.Bot):
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.announce_team_scores_ran = False
+        super().__init__(*args, tree_cls=MetricsCommandTree, **kwargs)
+        self.metrics_runner = None
+        self.http_session = None
+        # Strong references to fire-and-forget work so it isn't garbage collected mid-run
+        self.background_tasks = set()
+
+    async def setup_hook(self):
+        # Runs once per process, unlike on_ready which fires again after every reconnect
+        # Other events load on their first command
+        started_at = time.perf_counter()
+        events.default.load()
+        startup_timings["load_data"] = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        synced = await self.sync_commands()
+        startup_timings["tree_sync"] = time.perf_counter() - started_at
+        logging.info(f"Command tree {'synced' if synced else 'unchanged, sync skipped'}.")
+
+        # One pooled session for attachment downloads
+        self.http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+
+        self.announce_standings.start()
+        self.compact_journal.start()
+        self.watch_config.start()
+        self.evict_idle_events.start()
+        self.take_snapshots.start()
+        self.loop_lag_monitor = asyncio.create_task(monitor_loop_lag())
+        if METRICS_PORT:
+            try:
+                self.metrics_runner = await start_metrics_server()
+            except OSError as e:
+                logging.error(f"Couldn't start metrics server: {e}")
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        started_at = interaction.extras.get("started_at")
+        if started_at is not None:
+            metrics.observe("command_seconds", time.perf_counter() - started_at, command.qualified_name)
 
     async def on_ready(self):
-        load_data()
-        await self.tree.sync()
+        if "ready" not in startup_timings:
+            startup_timings["ready"] = time.perf_counter() - module_started_at
+            logging.info("Startup: " + ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in startup_timings.items()))
         print(f'Logged on as {self.user}!')
-        self.announce_team_scores.start()
-        self.send_graph.start()
-
-    @tasks.loop(minutes=60.0)
-    async def announce_team_scores(self):
-        logging.info("Automatic announce_team_scores triggered.")
-        channel = self.get_channel(1349758783827476583)
-        if channel:
-            embeds = []
-            sorted_teams = sorted(team_total_points.items(), key=lambda item: item[1], reverse=True)
-
-            for team, points in sorted_teams:
-                points_display = int(points) if isinstance(points, (int, float)) and points.is_integer() else points
-                team_color = team_colors.get(team, discord.Color.default())
-
-                embed = discord.Embed(
-                    description=f"**{team}:** {points_display} points",
-                    color=team_color,
-                )
-                embeds.append(embed)
-
-            if embeds:
-                await channel.send("**Team Leaderboard:**", embeds=embeds)
-            self.announce_team_scores_ran = True
-
-    @announce_team_scores.before_loop
-    async def before_announce_team_scores(self):
+
+    async def sync_commands(self):
+        """Sync the command tree with Discord only if its commands changed since the last sync."""
+        state = {"application_id": self.application_id, "hash": command_tree_hash(self.tree)}
+        try:
+            with open(COMMAND_TREE_FILE, "r", encoding="utf-8") as f:
+                if json.load(f) == state and not FORCE_TREE_SYNC:
+                    return False
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        await self.tree.sync()
+        write_json_atomic(COMMAND_TREE_FILE, state)
+        return True
+
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def close(self):
+        if self.metrics_runner:
+            await self.metrics_runner.cleanup()
+        if self.background_tasks:
+            await asyncio.wait(self.background_tasks, timeout=10)
+        if self.http_session:
+            await self.http_session.close()
+        await super().close()
+        for event in events.loaded():
+            event.close()
+        log_listener.stop()
+
+    @tasks.loop(minutes=10.0)
+    async def compact_journal(self):
+        for event in events.loaded():
+            event.compact()
+
+    @compact_journal.before_loop
+    async def before_compact_journal(self):
         await self.wait_until_ready()
 
-    @tasks.loop(minutes=60.0)
-    async def send_graph(self):
-        logging.info("Automatic send_graph triggered.")
-        channel = self.get_channel(1349758783827476583)
-        if channel:
-            try:
-                # Sort teams and points by points in descending order
-                sorted_teams_points = sorted(team_total_points.items(), key=lambda item: item[1])
-                teams = [item[0] for item in sorted_teams_points]
-                points = [item[1] for item in sorted_teams_points]
+    @tasks.loop(seconds=15.0)
+    async def watch_config(self):
+        await asyncio.to_thread(events.scan)
+        events.apply_settings()
+        for event in events.loaded():
+            await event.reload_config()
 
-                plt.figure(figsize=(10, 6))
+    @watch_config.before_loop
+    async def before_watch_config(self):
+        await self.wait_until_ready()
 
-                colors = [
-                    tuple(c / 255 for c in team_colors.get(team, discord.Color.default()).to_rgb())
-                    for team in teams
-                ]
+    @tasks.loop(minutes=5.0)
+    async def evict_idle_events(self):
+        await events.evict_idle()
 
-                plt.barh(teams, points, color=colors)
-                plt.xlabel("Total Points")
-                plt.title("Team Points Leaderboard")
+    @evict_idle_events.before_loop
+    async def before_evict_idle_events(self):
+        await self.wait_until_ready()
 
-                plt.subplots_adjust(left=0.2)  # Adjust the left margin
+    @tasks.loop(minutes=SNAPSHOT_INTERVAL_MINUTES)
+    async def take_snapshots(self):
+        for event in events.loaded():
+            try:
+                await event.snapshot()
+            except OSError as e:
+                logging.error(f"Couldn't snapshot {event.id}: {e}")
 
-                buffer = io.BytesIO()
-                plt.savefig(buffer, format='png')
-                buffer.seek(0)
+    @take_snapshots.before_loop
+    async def before_take_snapshots(self):
+        await self.wait_until_ready()
 
-                file = discord.File(buffer, filename="leaderboard.png")
-                await channel.send(file=file)
-                plt.close()
-            except Exception as e:
-                print(f"Error sending graph: {e}")
-                await channel.send(f"An error occurred while generating or sending the graph: {e}")
-        self.announce_team_scores_ran = False
+    @tasks.loop(minutes=ANNOUNCE_INTERVAL_MINUTES)
+    async def announce_standings(self):
+        if in_quiet_hours(datetime.now().hour):
+            return
+        for event in events.loaded():
+            if not event.team_leaderboard.changed_since_announced(ANNOUNCE_MIN_CHANGE):
+                logging.info(f"Standings unchanged for {event.id}, skipping announcement.")
+                continue
+            try:
+                await self.post_standings(event)
+            except (discord.HTTPException, OSError) as e:
+                # An unhandled error would end this loop for every event, not just this guild's
+                logging.error(f"Couldn't post standings for {event.id}: {e}")
+
+    @announce_standings.before_loop
+    async def before_announce_standings(self):
+        await self.wait_until_ready()
+
+    async def post_standings(self, event):
+        """Update the event's pinned leaderboard message in place, posting and pinning a new one if it's gone."""
+        async with event.standings_lock:
+            await self._post_standings(event)
+
+    async def _post_standings(self, event):
+        logging.info(f"Posting standings for {event.id}.")
+        channel = self.get_channel(event.announce_channel_id) if event.announce_channel_id else None
+        if not channel:
+            return
+
+        embeds = leaderboard_embeds(event)
+        # An edit can only carry one message's worth of embeds
+        embeds = chunk_embeds(embeds)[0] if embeds else []
+        try:
+            png = await points_history_png(event) if GRAPH_MODE == "history" else None
+            # The bar chart is also the fallback while there's too little history to draw lines
+            png = png or await leaderboard_png(event)
+            attachments = [discord.File(io.BytesIO(png), filename="leaderboard.png")]
+        except Exception as e:
+            logging.error(f"Error rendering graph: {e}")
+            attachments = []
+
+        message = await self.fetch_standings_message(event, channel)
+        if message:
+            try:
+                await message.edit(content="**Team Leaderboard:**", embeds=embeds, attachments=attachments)
+            except discord.NotFound:
+                message = None
+        if not message:
+            sent = await outbound.send(channel, "**Team Leaderboard:**", embeds=embeds, file=attachments[0] if attachments else None)
+            message = sent[0]
+            try:
+                await message.pin()
+            except (discord.Forbidden, discord.HTTPException) as e:
+                logging.warning(f"Couldn't pin the leaderboard message: {e}")
+            await asyncio.to_thread(write_json_atomic, event.file(ANNOUNCEMENT_STATE_FILE), {"channel_id": channel.id, "message_id": message.id})
+        event.standings_message = message
+
+        event.team_leaderboard.mark_announced()
+        logging.info(f"Outbound queue: {outbound.stats()}")
+
+    async def fetch_standings_message(self, event, channel):
+        if event.standings_message is not None and event.standings_message.channel.id == channel.id:
+            return event.standings_message
+        try:
+            with open(event.file(ANNOUNCEMENT_STATE_FILE), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if state.get("channel_id") != channel.id:
+            return None
+        try:
+            return await channel.fetch_message(state["message_id"])
+        except (discord.NotFound, discord.Forbidden):
+            return None
+
+def parse_quiet_hours(value):
+    """(start, end) hours from a QUIET_HOURS value like "1-8", or None if it's unset or malformed."""
+    if not value:
+        return None
+    try:
+        start, end = (int(part) for part in value.split("-"))
+    except ValueError:
+        logging.error(f"Ignoring QUIET_HOURS={value!r}, expected e.g. 1-8")
+        return None
+    return start, end
+
+quiet_hours = parse_quiet_hours(QUIET_HOURS)
+
+def in_quiet_hours(hour):
+    if quiet_hours is None:
+        return False
+    start, end = quiet_hours
+    if start <= end:
+        return start <= hour < end
+    # Wraps past midnight, e.g. 22-6
+    return hour >= start or hour < end
+
+def command_tree_hash(tree):
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands()), key=lambda command: command["name"])
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
 
 intents = discord.Intents.default()
 intents.message_content = True
 client = MyClient(command_prefix='!', intents=intents)
 
+def trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class AutocompleteIndex:
+    """Pre-lowercased search index over a fixed list of names, built once for autocomplete."""
+
+    def __init__(self, names, limit=25, cache_size=4096):
+        self.names = list(dict.fromkeys(names))
+        self.limit = limit
+        self.cache_size = cache_size
+        # Most indexes are never searched, so the lookup structures are built on first use
+        self._postings = None
+        self._cache = {}
+
+    def _build(self):
+        self._keys = [name.lower() for name in self.names]
+        self._choices = [app_commands.Choice(name=name, value=name) for name in self.names]
+        # Sorted keys give prefix hits with a bisect instead of a scan
+        self._sorted_ids = sorted(range(len(self._keys)), key=lambda i: self._keys[i])
+        self._sorted_keys = [self._keys[i] for i in self._sorted_ids]
+        self._postings = {}
+        for i, key in enumerate(self._keys):
+            for gram in trigrams(key):
+                self._postings.setdefault(gram, []).append(i)
+
+    def search(self, current):
+        query = " ".join(current.lower().split())
+        cached = self._cache.get(query)
+        if cached is not None:
+            return cached
+
+        if self._postings is None:
+            self._build()
+        if not query:
+            results = self._choices[:self.limit]
+        else:
+            ids = self._rank(query)
+            results = [self._choices[i] for i in ids[:self.limit]]
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[query] = results
+        return results
+
+    def _rank(self, query):
+        # Prefix hits first, then substring hits, then fuzzy trigram matches for typos
+        start = bisect.bisect_left(self._sorted_keys, query)
+        prefix_ids = []
+        for pos in range(start, len(self._sorted_keys)):
+            if not self._sorted_keys[pos].startswith(query):
+                break
+            prefix_ids.append(self._sorted_ids[pos])
+        prefix_ids.sort()
+        ranked = prefix_ids
+        if len(ranked) >= self.limit:
+            return ranked
+
+        seen = set(ranked)
+        grams = trigrams(query)
+        hits = {}
+        for gram in grams:
+            for i in self._postings.get(gram, ()):
+                hits[i] = hits.get(i, 0) + 1
+
+        if len(query) < 3:
+            candidates = range(len(self._keys))
+        else:
+            candidates = sorted(hits)
+        ranked.extend(i for i in candidates if i not in seen and query in self._keys[i])
+        if len(ranked) >= self.limit or len(query) < 4:
+            return ranked
+
+        seen = set(ranked)
+        fuzzy = [
+            (-count / len(grams), i)
+            for i, count in hits.items()
+            if i not in seen and count / len(grams) >= 0.5
+        ]
+        fuzzy.sort()
+        ranked.extend(i for _, i in fuzzy)
+        return ranked
+
+def build_drop_indexes(boss_drops):
+    boss_index = AutocompleteIndex(boss_drops.keys())
+    drop_indexes = {
+        boss_name: AutocompleteIndex(drop["drop"] for drop in drops)
+        for boss_name, drops in boss_drops.items()
+    }
+    return boss_index, drop_indexes
+
+def build_player_indexes(roster):
+    player_index = AutocompleteIndex(member["discord_user"] for members in roster.values() for member in members)
+    team_player_indexes = {
+        team: AutocompleteIndex(member["discord_user"] for member in members)
+        for team, members in roster.items()
+    }
+    return player_index, team_player_indexes
+
+@timed_autocomplete
 async def boss_autocomplete(
     interaction: discord.Interaction, current: str
 ) -> list[app_commands.Choice[str]]:
-    suggestions = [
-        app_commands.Choice(name=boss, value=boss)
-        for boss in boss_drops.keys()
-        if current.lower() in boss.lower()
-    ]
-    return suggestions[:25]
+    event = await events.get(interaction.guild_id)
+    return event.boss_index.search(current)
 
+@timed_autocomplete
 async def drop_autocomplete(
     interaction: discord.Interaction, current: str
 ) -> list[app_commands.Choice[str]]:
@@ -138,429 +1576,1800 @@ async def drop_autocomplete(
     if not boss_name:
         return []
 
-    if boss_name in boss_drops:
-        drops = boss_drops[boss_name]
-        suggestions = [
-            app_commands.Choice(name=drop["drop"], value=drop["drop"])
-            for drop in drops
-            if current.lower() in drop["drop"].lower()
-        ]
-        return suggestions[:25]
-    return []
+    event = await events.get(interaction.guild_id)
+    index = event.drop_indexes.get(boss_name)
+    if index is None:
+        return []
+    return index.search(current)
 
+@timed_autocomplete
 async def team_autocomplete(
     interaction: discord.Interaction, current: str
 ) -> list[app_commands.Choice[str]]:
-    suggestions = [
-        app_commands.Choice(name=team, value=team)
-        for team in team_roster
-        if current.lower() in team.lower()
-    ]
-    return suggestions[:25]
+    event = await events.get(interaction.guild_id)
+    return event.team_index.search(current)
 
-team_drop_counts = {team: {} for team in team_roster}
-team_total_points = {team: 0 for team in team_roster}
+@timed_autocomplete
+async def player_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[app_commands.Choice[str]]:
+    event = await events.get(interaction.guild_id)
+    return event.player_index.search(current)
 
-logging.basicConfig(filename='bot_logs.log', level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+@timed_autocomplete
+async def team_player_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[app_commands.Choice[str]]:
+    event = await events.get(interaction.guild_id)
+    index = event.team_player_indexes.get(interaction.namespace.team_name)
+    if index is None:
+        return []
+    return index.search(current)
 
-@client.tree.command(name="boss_drops_all", description="Shows all boss drops and points in embeds (admin only).")
-async def boss_drops_all(interaction: discord.Interaction):
-    logging.info(f"User {interaction.user.name} used /boss_drops_all")
-    if interaction.user.name not in ADMINS: #assuming you have ADMINS defined
-        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+@timed_autocomplete
+async def snapshot_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[app_commands.Choice[str]]:
+    event = await events.get(interaction.guild_id)
+    snapshots = await asyncio.to_thread(event.list_snapshots)
+    choices = []
+    for taken_at, reason, _ in snapshots:
+        value = taken_at.isoformat(sep=" ")
+        if value.startswith(current.strip()):
+            choices.append(app_commands.Choice(name=f"{value} ({reason})", value=value))
+            if len(choices) == 25:
+                break
+    return choices
 
-    embeds = []
+def build_boss_embeds(boss_drops):
+    boss_embeds = {}
     for boss_name, drops in boss_drops.items():
-        embed = discord.Embed(title=f"{boss_name}", color=discord.Color.blue())
+        # Embeds hold at most 25 fields, so long drop tables are split into pages
+        pages = [drops[i:i + 25] for i in range(0, len(drops), 25)] or [[]]
+        embeds = []
+        for page_number, page in enumerate(pages, start=1):
+            title = boss_name if len(pages) == 1 else f"{boss_name} ({page_number}/{len(pages)})"
+            embed = discord.Embed(title=title, color=discord.Color.blue())
+            for drop_info in page:
+                embed.add_field(name=drop_info["drop"], value=f"Points: {drop_info['points']}", inline=False)
+            embeds.append(embed)
+        boss_embeds[boss_name] = embeds
+    return boss_embeds, chunk_embeds([embed for embeds in boss_embeds.values() for embed in embeds])
+
+RESCORE_ON_RELOAD = os.environ.get("RESCORE_ON_RELOAD", "1") == "1"
+
+def validate_drops(data):
+    if not isinstance(data, dict) or not data:
+        raise ValueError("expected a non-empty object of boss name -> drop list")
+    for boss_name, drops in data.items():
+        if not isinstance(drops, list):
+            raise ValueError(f"{boss_name}: expected a list of drops")
+        seen = set()
+        for drop in drops:
+            if not isinstance(drop, dict) or not isinstance(drop.get("drop"), str):
+                raise ValueError(f"{boss_name}: every drop needs a \"drop\" name")
+            if not isinstance(drop.get("points"), (int, float)) or drop["points"] < 0:
+                raise ValueError(f"{boss_name} / {drop['drop']}: points must be a non-negative number")
+            if not isinstance(drop.get("full_value_count", 1), int) or drop.get("full_value_count", 1) < 1:
+                raise ValueError(f"{boss_name} / {drop['drop']}: full_value_count must be a positive integer")
+            if not isinstance(drop.get("duplicate_multiplier", 0.5), (int, float)):
+                raise ValueError(f"{boss_name} / {drop['drop']}: duplicate_multiplier must be a number")
+            if normalize_drop(drop["drop"]) in seen:
+                raise ValueError(f"{boss_name}: duplicate drop {drop['drop']}")
+            seen.add(normalize_drop(drop["drop"]))
+
+def validate_roster(data):
+    if not isinstance(data, dict) or not data:
+        raise ValueError("expected a non-empty object of team name -> member list")
+    seen = {}
+    for team, members in data.items():
+        if not isinstance(members, list):
+            raise ValueError(f"{team}: expected a list of members")
+        for member in members:
+            if not isinstance(member, dict) or not all(isinstance(member.get(key), str) for key in ("discord_user", "ign", "role")):
+                raise ValueError(f"{team}: every member needs discord_user, ign and role")
+            if member["role"] not in ("leader", "member"):
+                raise ValueError(f"{team} / {member['discord_user']}: role must be leader or member")
+            if member["discord_user"] in seen:
+                raise ValueError(f"{member['discord_user']} is on both {seen[member['discord_user']]} and {team}")
+            seen[member["discord_user"]] = team
+
+def build_drops_config(path):
+    """Parse, validate and derive everything that depends on drops.json. Runs off the event loop."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    validate_drops(data)
+    index, indexes = build_drop_indexes(data)
+    embeds, batches = build_boss_embeds(data)
+    return {
+        "boss_drops": data,
+        "drop_catalog": compile_catalog(data),
+        "boss_index": index,
+        "drop_indexes": indexes,
+        "boss_embeds": embeds,
+        "boss_embed_batches": batches,
+    }
+
+def build_roster_config(path):
+    """Parse, validate and derive everything that depends on team_roster.json. Runs off the event loop."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    validate_roster(data)
+    player_index, team_player_indexes = build_player_indexes(data)
+    return {
+        "team_roster": data,
+        "roster_index": build_roster_index(data),
+        "team_index": AutocompleteIndex(data.keys()),
+        "player_index": player_index,
+        "team_player_indexes": team_player_indexes,
+    }
+
+def diff_catalog(old, new):
+    changes = []
+    for key in new.keys() - old.keys():
+        changes.append(f"+ {new[key].boss} / {new[key].drop}: {display_points(new[key].points)} points")
+    for key in old.keys() - new.keys():
+        changes.append(f"- {old[key].boss} / {old[key].drop}")
+    for key in old.keys() & new.keys():
+        before, after = old[key], new[key]
+        if before.points != after.points:
+            changes.append(f"~ {after.boss} / {after.drop}: {display_points(before.points)} → {display_points(after.points)} points")
+        if (before.full_value_count, before.duplicate_multiplier) != (after.full_value_count, after.duplicate_multiplier):
+            changes.append(
+                f"~ {after.boss} / {after.drop}: full value for first {after.full_value_count}, "
+                f"then ×{after.duplicate_multiplier} (was {before.full_value_count}, ×{before.duplicate_multiplier})"
+            )
+    return sorted(changes, key=lambda line: line[2:])
+
+def diff_roster(old_roster, new_roster, old, new):
+    changes = []
+    for team in new_roster.keys() - old_roster.keys():
+        changes.append(f"+ team {team}")
+    for team in old_roster.keys() - new_roster.keys():
+        changes.append(f"- team {team}")
+    for user in new.keys() - old.keys():
+        changes.append(f"+ {user} ({new[user].ign}) on {new[user].team}")
+    for user in old.keys() - new.keys():
+        changes.append(f"- {user} from {old[user].team}")
+    for user in old.keys() & new.keys():
+        if old[user] != new[user]:
+            changes.append(f"~ {user}: {old[user].team} {old[user].role} → {new[user].team} {new[user].role}")
+    return changes
+
+CONFIG_BUILDERS = (("drops.json", build_drops_config), ("team_roster.json", build_roster_config))
+
+# Handlers only enqueue log records; a listener thread does the file I/O
+log_queue = queue.SimpleQueue()
+log_file_handler = logging.FileHandler('bot_logs.log', encoding="utf-8")
+log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_listener = logging.handlers.QueueListener(log_queue, log_file_handler)
+log_queue_handler = logging.handlers.QueueHandler(log_queue)
+log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[log_queue_handler])
+log_listener.start()
+
+Submission = namedtuple("Submission", ["point_value", "nth", "duplicate"])
+
+# Interaction IDs are unique across guilds, so one dedupe table serves every event
+processed_submissions = OrderedDict()
+MAX_PROCESSED_SUBMISSIONS = 10000
+
+def remember_submission(submission_id, result):
+    processed_submissions[submission_id] = result
+    if len(processed_submissions) > MAX_PROCESSED_SUBMISSIONS:
+        processed_submissions.popitem(last=False)
+
+def parse_bulk_count(value):
+    """A bulk row's count. Missing or blank means 1; anything else has to be a whole number."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return 1
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(value)
+    return int(value)
+
+def parse_bulk_drops(filename, data):
+    """Read bulk drop rows from CSV (with a header row) or a JSON list of objects.
+
+    Returns (line number, row dict) pairs. Raises ValueError if the file isn't either format.
+    """
+    text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+    if filename.lower().endswith(".json"):
+        items = json.loads(text)
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise ValueError("expected a JSON list of {team, boss, drop, count} objects")
+        return list(enumerate(items, start=1))
+    reader = csv.DictReader(io.StringIO(text))
+    missing = {"team", "boss", "drop"} - {name.strip().lower() for name in reader.fieldnames or ()}
+    if missing:
+        raise ValueError(f"CSV header is missing {', '.join(sorted(missing))}")
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    # Line 1 is the header
+    return [(line, row) for line, row in enumerate(reader, start=2)]
+
+class EvidenceStore:
+    """Content-addressed screenshot store. Files are named by their SHA-256, so identical uploads share one file.
+
+    Once the files pass max_bytes the least recently used are deleted, but every hash seen
+    stays in the index so a re-posted screenshot is still caught after its file is gone.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory, max_bytes=int(SCREENSHOT_STORE_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # hash -> (size, file name), least recently used first
+        self._files = OrderedDict()
+        # hash -> the submission it was first attached to
+        self.seen = {}
+        self.total_bytes = 0
+        try:
+            with open(os.path.join(directory, self.INDEX_FILE), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"Starting a new screenshot index in {directory}: {e}")
+            return
+        self.seen = index.get("seen", {})
+        for digest, size, name in index.get("files", []):
+            if os.path.exists(os.path.join(directory, name)):
+                self._files[digest] = (size, name)
+                self.total_bytes += size
+
+    def __len__(self):
+        return len(self._files)
+
+    def path(self, digest):
+        with self._lock:
+            if digest not in self._files:
+                return None
+            self._files.move_to_end(digest)
+            return os.path.join(self.directory, self._files[digest][1])
+
+    def put(self, data, extension, submission):
+        """Hash and store a screenshot. Blocking, so run it in a worker thread.
+
+        Returns (hash, the earlier submission with the same screenshot or None).
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            first = self.seen.setdefault(digest, submission)
+            if digest in self._files:
+                self._files.move_to_end(digest)
+            else:
+                name = digest + extension
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = os.path.join(self.directory, f"{name}.tmp")
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, os.path.join(self.directory, name))
+                self._files[digest] = (len(data), name)
+                self.total_bytes += len(data)
+                self._evict()
+            write_json_atomic(os.path.join(self.directory, self.INDEX_FILE), {
+                "files": [[key, size, name] for key, (size, name) in self._files.items()],
+                "seen": self.seen,
+            })
+        return digest, (None if first is submission else first)
+
+    def _evict(self):
+        # The newest file always stays, even if it alone is over the cap
+        while self.total_bytes > self.max_bytes and len(self._files) > 1:
+            digest, (size, name) = self._files.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            logging.info(f"Evicted screenshot {digest[:12]} ({size} bytes) from {self.directory}")
+
+class ApprovalQueue:
+    """Drops waiting for an admin, oldest first.
+
+    IDs only grow, so the entries dict is already in ID order: adding and removing
+    are O(1), and a page is a slice starting at its offset.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, pending_id):
+        return pending_id in self._entries
+
+    def add(self, user, team, boss_name, drop_name, player=None):
+        pending = {
+            "id": self._next_id,
+            "user": user,
+            "player": player,
+            "team": team,
+            "boss": boss_name,
+            "drop": drop_name,
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "screenshot": None,
+            "duplicate_screenshot": False,
+        }
+        self._next_id += 1
+        self._entries[pending["id"]] = pending
+        return pending
+
+    def get(self, pending_id):
+        return self._entries.get(pending_id)
+
+    def page(self, number, size=REVIEW_PAGE_SIZE):
+        return list(itertools.islice(self._entries.values(), number * size, (number + 1) * size))
+
+    def pages(self, size=REVIEW_PAGE_SIZE):
+        return max(1, -(-len(self._entries) // size))
+
+    def pop(self, pending_ids):
+        """Remove and return the given entries, oldest first. Unknown IDs are ignored."""
+        popped = []
+        for pending_id in sorted(set(pending_ids)):
+            pending = self._entries.pop(pending_id, None)
+            if pending is not None:
+                popped.append(pending)
+        return popped
+
+    def to_dict(self):
+        # Entries are flat, so shallow copies are enough to hand them to another thread
+        return {"next_id": self._next_id, "pending": [dict(pending) for pending in self._entries.values()]}
+
+    def load(self, data):
+        entries = sorted(data["pending"], key=lambda pending: pending["id"])
+        self._entries = {pending["id"]: pending for pending in entries}
+        # Never hand out an ID again, even after rolling back to an older queue
+        self._next_id = max(data["next_id"], entries[-1]["id"] + 1 if entries else 1, self._next_id)
+
+def write_snapshot(path, state):
+    started_at = time.perf_counter()
+    state = dict(state, points_history=state["points_history"].to_dict())
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+    metrics.observe("snapshot_seconds", time.perf_counter() - started_at)
+
+def read_snapshot(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+class Event:
+    """One event's config, standings, storage and caches.
+
+    Nothing here is shared between events: each has its own files, storage worker
+    and locks, so a busy event never makes another one wait.
+    """
+
+    def __init__(self, event_id, guild_id, directory, settings):
+        self.id = event_id
+        self.guild_id = guild_id
+        self.directory = directory
+        self.apply_settings(settings)
+        self.last_used = time.monotonic()
+
+        # Sets boss_drops, drop_catalog, team_roster, roster_index and the autocomplete indexes
+        self.config_mtimes = {}
+        for name, builder in CONFIG_BUILDERS:
+            path = self.file(name)
+            self.config_mtimes[name] = os.stat(path).st_mtime_ns
+            vars(self).update(builder(path))
+        self.config_lock = asyncio.Lock()
+        self.snapshot_lock = asyncio.Lock()
+        # One set per snapshot or storage save still reading the teams' nested drop dicts; see share_state()
+        self._readers = []
+        self.evidence = EvidenceStore(self.file(SCREENSHOT_DIR))
+        self.storage = open_storage(directory, settings.get("storage"), settings.get("storage_path"))
+
+        self.team_drop_counts = {team: {} for team in self.team_roster}
+        self.team_total_points = {team: 0 for team in self.team_roster}
+        self.team_leaderboard = Leaderboard()
+        # team -> boss -> drop -> the player credited with each copy, in the order they were counted,
+        # so the last entry is the copy a removal takes back. None marks an unattributed drop.
+        self.drop_contributors = {}
+        # Aggregates kept up to date per submission so player reads never scan history
+        self.player_points = {}
+        self.player_drop_counts = {}
+        self.player_leaderboards = {}
+        self.points_history = PointsHistory()
+        self.approvals = ApprovalQueue()
+        self._approvals_dirty = False
+        self._approvals_flush = None
+        self.team_stats_cache = {}
+        self.team_locks = {}
+        self.graph_cache = {"key": None, "png": None, "task": None}
+        self._scoring_engine = (None, None)
+        self.standings_message = None
+        self.standings_lock = asyncio.Lock()
+
+    def __repr__(self):
+        return f"<Event {self.id} guild={self.guild_id}>"
+
+    def file(self, name):
+        return os.path.join(self.directory, name)
+
+    def apply_settings(self, settings):
+        """Take the event.json settings that can change while the event is loaded. Storage settings apply on the next load."""
+        colors = dict(team_colors)
+        for team, color in settings.get("team_colors", {}).items():
+            colors[team] = discord.Color(int(str(color).lstrip("#"), 16))
+        self.settings = settings
+        self.name = settings.get("name", self.id)
+        self.admins = list(settings.get("admins", []))
+        self.announce_channel_id = settings.get("announce_channel_id")
+        self.require_approval = bool(settings.get("require_approval", REQUIRE_APPROVAL))
+        self.team_colors = colors
+
+    def is_admin(self, user_name):
+        return user_name in self.admins
+
+    def team_color(self, team):
+        return self.team_colors.get(team, discord.Color.default())
+
+    def busy(self):
+        return (
+            self.config_lock.locked()
+            or self.snapshot_lock.locked()
+            or self.standings_lock.locked()
+            or any(lock.locked() for lock in self.team_locks.values())
+        )
+
+    def find_drop(self, boss_name, drop_name):
+        return self.drop_catalog.get((boss_name, normalize_drop(drop_name)))
+
+    def find_member(self, discord_user):
+        return self.roster_index.get(discord_user)
+
+    def scoring_engine(self):
+        catalog, engine = self._scoring_engine
+        if catalog is not self.drop_catalog:
+            engine = ScoringEngine(self.drop_catalog)
+            self._scoring_engine = (self.drop_catalog, engine)
+        return engine
+
+    def compute_team_points(self, drop_counts):
+        teams = list(dict.fromkeys([*self.team_roster, *drop_counts]))
+        return self.scoring_engine().team_points(drop_counts, teams)
+
+    def record_event(self, kind, user, team, boss_name, drop_name, points, player=None):
+        member = self.roster_index.get(player)
+        self.storage.record_event(make_event(kind, user, team, boss_name, drop_name, points, player, member.ign if member else None))
+
+    def save(self):
+        # Full state changes (reset, recalculate) replace the stored state wholesale
+        teams, drop_counts, contributors = self.share_state()
+        self.release_when_done(teams, self.storage.save_state(drop_counts, self.team_total_points, contributors))
+        self.save_side_files()
+
+    def compact(self):
+        teams, drop_counts, contributors = self.share_state()
+        self.release_when_done(teams, self.storage.compact(drop_counts, self.team_total_points, contributors))
+        self.storage.submit(write_json_atomic, self.file(POINTS_HISTORY_FILE), self.points_history.to_dict())
+        # Written now rather than on a timer that may outlive the storage worker
+        self.write_approvals()
+
+    def save_side_files(self):
+        self.storage.submit(write_json_atomic, self.file(POINTS_HISTORY_FILE), self.points_history.to_dict())
+        self.save_approvals()
+
+    def load(self):
+        self.team_drop_counts, self.team_total_points, self.drop_contributors = self.storage.load()
+        for team in self.team_roster:
+            self.team_drop_counts.setdefault(team, {})
+            self.team_total_points.setdefault(team, 0)
+        self.team_leaderboard.reset(self.team_total_points)
+        self.invalidate_team_stats()
+        self.rebuild_player_stats()
+        self.load_points_history()
+        self.record_points_history()
+        self.load_approvals()
+
+    def close(self):
+        self.compact()
+        self.storage.close()
+
+    def load_points_history(self):
+        try:
+            with open(self.file(POINTS_HISTORY_FILE), "r", encoding="utf-8") as f:
+                self.points_history.load(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError) as e:
+            logging.warning(f"Starting a new points history for {self.id}: {e}")
+            self.points_history.clear()
+
+    def load_approvals(self):
+        try:
+            with open(self.file(PENDING_FILE), "r", encoding="utf-8") as f:
+                self.approvals.load(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logging.error(f"Couldn't read pending drops for {self.id}, starting an empty queue: {e}")
+
+    def save_approvals(self):
+        """Write the approval queue soon, once for every change made in the next APPROVALS_SAVE_SECONDS."""
+        self._approvals_dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Off the event loop (closing, command line import) there's nothing to batch with
+            return self.write_approvals()
+        if self._approvals_flush is None:
+            self._approvals_flush = loop.call_later(APPROVALS_SAVE_SECONDS, self._flush_approvals)
+
+    def _flush_approvals(self):
+        self._approvals_flush = None
+        if self._approvals_dirty:
+            self.write_approvals()
+
+    def write_approvals(self):
+        self._approvals_dirty = False
+        # Copied now, written on the storage thread in order with everything else
+        self.storage.submit(write_json_atomic, self.file(PENDING_FILE), self.approvals.to_dict())
+
+    def queue_drop(self, submission_id, user, team, entry, player=None):
+        """Queue a drop for approval, at most once per submission_id (the interaction ID). Returns (pending entry, duplicate)."""
+        previous = processed_submissions.get(submission_id)
+        if previous is not None:
+            return previous, True
+        pending = self.approvals.add(user, team, entry.boss, entry.drop, player)
+        remember_submission(submission_id, pending)
+        self.save_approvals()
+        return pending, False
+
+    def approve(self, pending_ids):
+        """Apply pending drops oldest first in one batch, journaled as drops by whoever submitted them.
+
+        Returns (applied entries, entries that no longer match the roster or catalog, points added per team).
+        """
+        applied, stale, rows = [], [], []
+        for pending in self.approvals.pop(pending_ids):
+            entry = self.find_drop(pending["boss"], pending["drop"])
+            if entry is None or pending["team"] not in self.team_roster:
+                stale.append(pending)
+                continue
+            applied.append(pending)
+            rows.append((pending["team"], entry, 1, pending["player"], pending["user"]))
+        if rows:
+            # apply_bulk also writes the shortened queue
+            added = self.apply_bulk(rows)
+        else:
+            added = {}
+            self.save_approvals()
+        return applied, stale, added
+
+    def reject(self, pending_ids):
+        rejected = self.approvals.pop(pending_ids)
+        self.save_approvals()
+        return rejected
+
+    def record_points_history(self, teams=None):
+        for team in self.team_total_points if teams is None else teams:
+            self.points_history.record(team, self.team_total_points[team])
+
+    def invalidate_team_stats(self, team=None):
+        if team is None:
+            self.team_stats_cache.clear()
+        else:
+            self.team_stats_cache.pop(team, None)
 
-        for drop_info in drops:
-            drop_name = drop_info["drop"]
-            points = drop_info["points"]
-            embed.add_field(name=drop_name, value=f"Points: {points}", inline=False)
+    def team_stats_embed(self, team):
+        embed = self.team_stats_cache.get(team)
+        if embed is not None:
+            return embed
 
-            if len(embed.fields) >= 25:
-              embed.add_field(name="Warning", value=f"Too many drops for {boss_name}. Some drops may not be shown.", inline=False)
-              break #stop adding fields.
+        lines = [
+            f"- {drop_name} from {boss_name}: {count} times"
+            for boss_name, drops in self.team_drop_counts.get(team, {}).items()
+            for drop_name, count in drops.items()
+        ]
+        lines.append(f"**Total Points: {display_points(self.team_total_points.get(team, 0))}**")
+        embed = discord.Embed(title=f"{team} Stats", description="\n".join(lines) + "\n", color=self.team_color(team))
+        self.team_stats_cache[team] = embed
+        return embed
+
+    def credit_player(self, team, player, entry, point_value, delta=1):
+        if player is None:
+            return
+        boss_counts = self.player_drop_counts.setdefault(player, {}).setdefault(entry.boss, {})
+        boss_counts[entry.drop] = boss_counts.get(entry.drop, 0) + delta
+        if boss_counts[entry.drop] <= 0:
+            del boss_counts[entry.drop]
+            if not boss_counts:
+                del self.player_drop_counts[player][entry.boss]
+        self.player_points[player] = self.player_points.get(player, 0) + delta * point_value
+        leaderboard = self.player_leaderboards.setdefault(team, Leaderboard())
+        leaderboard.update(player, leaderboard.score(player) + delta * point_value)
+
+    def rebuild_player_stats(self):
+        """Recompute every player aggregate from drop_contributors, after a load, reset or rescore."""
+        # Pads and trims contributor lists in place
+        for team in set().union(*self._readers):
+            self._own(team)
+        self.player_points.clear()
+        self.player_drop_counts.clear()
+        team_scores = {team: {} for team in self.team_roster}
+        for team, bosses in self.team_drop_counts.items():
+            for boss_name, drops in bosses.items():
+                for drop_name, count in drops.items():
+                    players = self.drop_contributors.setdefault(team, {}).setdefault(boss_name, {}).setdefault(drop_name, [])
+                    # Drops counted before attribution existed come first and stay unattributed
+                    if len(players) < count:
+                        players[:0] = [None] * (count - len(players))
+                    del players[count:]
+                    entry = self.find_drop(boss_name, drop_name)
+                    for nth, player in enumerate(players, start=1):
+                        if player is None or entry is None:
+                            continue
+                        point_value = drop_points(entry, nth)
+                        boss_counts = self.player_drop_counts.setdefault(player, {}).setdefault(entry.boss, {})
+                        boss_counts[entry.drop] = boss_counts.get(entry.drop, 0) + 1
+                        self.player_points[player] = self.player_points.get(player, 0) + point_value
+                        scores = team_scores.setdefault(team, {})
+                        scores[player] = scores.get(player, 0) + point_value
+        self.player_leaderboards.clear()
+        for team, scores in team_scores.items():
+            self.player_leaderboards[team] = Leaderboard(scores)
+
+    def player_stats_embed(self, player):
+        member = self.roster_index.get(player)
+        team = member.team if member else None
+        title = f"{member.ign} ({player})" if member else player
+        lines = [
+            f"- {drop_name} from {boss_name}: {count} times"
+            for boss_name, drops in self.player_drop_counts.get(player, {}).items()
+            for drop_name, count in drops.items()
+        ] or ["No drops yet."]
+        lines.append(f"**Total Points: {display_points(self.player_points.get(player, 0))}**")
+        leaderboard = self.player_leaderboards.get(team)
+        if leaderboard is not None and player in leaderboard:
+            lines.append(f"Rank {leaderboard.rank(player)} of {len(leaderboard)} on {team}")
+        return discord.Embed(title=title, description="\n".join(lines), color=self.team_color(team))
+
+    def top_contributors_embed(self, team, n=10):
+        leaderboard = self.player_leaderboards.get(team) or Leaderboard()
+        lines = []
+        for rank, (player, points) in enumerate(leaderboard.top(n), start=1):
+            member = self.roster_index.get(player)
+            lines.append(f"**{rank}. {member.ign if member else player}**: {display_points(points)} points")
+        description = "\n".join(lines) or "No drops yet."
+        return discord.Embed(title=f"{team} Top Contributors", description=description, color=self.team_color(team))
+
+    def add_drop(self, team, entry, player=None):
+        self._own(team)
+        boss_counts = self.team_drop_counts.setdefault(team, {}).setdefault(entry.boss, {})
+        nth = boss_counts.get(entry.drop, 0) + 1
+        point_value = drop_points(entry, nth)
+        boss_counts[entry.drop] = nth
+        self.team_total_points[team] = self.team_total_points.get(team, 0) + point_value
+        self.team_leaderboard.update(team, self.team_total_points[team])
+        self.points_history.record(team, self.team_total_points[team])
+        self.invalidate_team_stats(team)
+        push_contributor(self.drop_contributors, team, entry.boss, entry.drop, player)
+        self.credit_player(team, player, entry, point_value)
+        return point_value, nth
+
+    def remove_one_drop(self, team, entry):
+        """Remove a team's latest copy of a drop. Returns (points, credited player), or None if there was none."""
+        self._own(team)
+        team_drops = self.team_drop_counts.get(team, {})
+        boss_counts = team_drops.get(entry.boss, {})
+        nth = boss_counts.get(entry.drop, 0)
+        if nth <= 0:
+            return None
+
+        point_value = drop_points(entry, nth)
+        self.team_total_points[team] -= point_value
+        self.team_leaderboard.update(team, self.team_total_points[team])
+        self.points_history.record(team, self.team_total_points[team])
+        self.invalidate_team_stats(team)
+        boss_counts[entry.drop] -= 1
+        if boss_counts[entry.drop] == 0:
+            del boss_counts[entry.drop]
+            if not boss_counts:
+                del team_drops[entry.boss]
+        player = pop_contributor(self.drop_contributors, team, entry.boss, entry.drop)
+        self.credit_player(team, player, entry, point_value, -1)
+        return point_value, player
+
+    def team_lock(self, team):
+        lock = self.team_locks.get(team)
+        if lock is None:
+            lock = self.team_locks[team] = asyncio.Lock()
+        return lock
+
+    async def submit_drop(self, submission_id, user, team, entry, player=None):
+        """Add one drop for a team, credited to player, at most once per submission_id (the interaction ID)."""
+        previous = processed_submissions.get(submission_id)
+        if previous is not None:
+            return previous._replace(duplicate=True)
+
+        # One lock per team: a team's count and points change together, other teams don't wait
+        async with self.team_lock(team):
+            previous = processed_submissions.get(submission_id)
+            if previous is not None:
+                return previous._replace(duplicate=True)
+            point_value, nth = self.add_drop(team, entry, player)
+            self.record_event("drop", user, team, entry.boss, entry.drop, point_value, player)
+            result = Submission(point_value, nth, False)
+            remember_submission(submission_id, result)
+        return result
+
+    async def submit_removal(self, submission_id, user, team, entry):
+        """Remove one drop from a team, at most once per submission_id. Returns None if there was nothing to remove."""
+        previous = processed_submissions.get(submission_id)
+        if previous is not None:
+            return previous._replace(duplicate=True)
+
+        async with self.team_lock(team):
+            previous = processed_submissions.get(submission_id)
+            if previous is not None:
+                return previous._replace(duplicate=True)
+            removed = self.remove_one_drop(team, entry)
+            if removed is None:
+                return None
+            point_value, player = removed
+            self.record_event("remove", user, team, entry.boss, entry.drop, point_value, player)
+            result = Submission(point_value, None, False)
+            remember_submission(submission_id, result)
+        return result
+
+    def validate_bulk(self, rows, user=None):
+        """Check bulk rows against the roster and catalog in one pass.
+
+        Returns the (team, entry, count, player, user) rows to apply and a list of error lines.
+        """
+        valid, errors = [], []
+        for line, row in rows:
+            team = str(row.get("team") or "").strip()
+            boss_name = str(row.get("boss") or "").strip()
+            drop_name = str(row.get("drop") or "").strip()
+            player = str(row.get("player") or "").strip() or None
+            try:
+                count = parse_bulk_count(row.get("count"))
+            except (TypeError, ValueError):
+                errors.append(f"Line {line}: count '{row.get('count')}' isn't a whole number")
+                continue
+            if team not in self.team_roster:
+                errors.append(f"Line {line}: team '{team}' not found")
+            elif count < 1:
+                errors.append(f"Line {line}: count must be at least 1")
+            elif boss_name not in self.boss_drops:
+                errors.append(f"Line {line}: boss '{boss_name}' not found")
+            elif (entry := self.find_drop(boss_name, drop_name)) is None:
+                errors.append(f"Line {line}: drop '{drop_name}' not found for {boss_name}")
+            elif player is not None and getattr(self.find_member(player), "team", None) != team:
+                errors.append(f"Line {line}: user '{player}' is not on {team}")
+            else:
+                valid.append((team, entry, count, player, user))
+        return valid, errors
+
+    def apply_bulk(self, rows):
+        """Add validated bulk rows as one batch and journal them in one write. Returns the points added per team."""
+        added = {}
+        records = []
+        # Crediting copy by copy beats rebuilding every player aggregate for review-sized batches, not for big imports
+        incremental = len(rows) <= 100
+        for team, entry, count, player, user in rows:
+            self._own(team)
+            boss_counts = self.team_drop_counts.setdefault(team, {}).setdefault(entry.boss, {})
+            before = boss_counts.get(entry.drop, 0)
+            boss_counts[entry.drop] = before + count
+            added[team] = added.get(team, 0) + total_drop_points(entry, before + count) - total_drop_points(entry, before)
+            self.drop_contributors.setdefault(team, {}).setdefault(entry.boss, {}).setdefault(entry.drop, []).extend([player] * count)
+            member = self.roster_index.get(player)
+            records.extend(
+                make_event("drop", user, team, entry.boss, entry.drop, drop_points(entry, nth), player, member.ign if member else None)
+                for nth in range(before + 1, before + count + 1)
+            )
+            if player is not None and incremental:
+                for nth in range(before + 1, before + count + 1):
+                    self.credit_player(team, player, entry, drop_points(entry, nth))
+
+        # Standings, caches and history move once per team rather than once per drop
+        for team, points in added.items():
+            self.team_total_points[team] = self.team_total_points.get(team, 0) + points
+            self.team_leaderboard.update(team, self.team_total_points[team])
+            self.invalidate_team_stats(team)
+        self.record_points_history(added)
+        if not incremental:
+            self.rebuild_player_stats()
+        self.storage.record_drops(records)
+        self.save_side_files()
+        return added
+
+    def bulk_summary(self, rows, added):
+        drops = sum(count for _, _, count, _, _ in rows)
+        lines = [f"Added {drops} drops from {len(rows)} rows."]
+        for team, points in sorted(added.items(), key=lambda item: -item[1]):
+            lines.append(f"**{team}**: +{display_points(points)} points (now {display_points(self.team_total_points[team])})")
+        return lines
+
+    def recalculate(self):
+        self.team_total_points = self.compute_team_points(self.team_drop_counts)
+        self.team_leaderboard.reset(self.team_total_points)
+        self.invalidate_team_stats()
+        self.rebuild_player_stats()
+        self.record_points_history()
+        self.save()
+
+    def _own(self, team):
+        """Copy a team's nested drop dicts before changing them if a snapshot or save is still reading them."""
+        readers = [teams for teams in self._readers if team in teams]
+        if readers:
+            for teams in readers:
+                teams.discard(team)
+            self.team_drop_counts[team] = copy.deepcopy(self.team_drop_counts.get(team, {}))
+            self.drop_contributors[team] = copy.deepcopy(self.drop_contributors.get(team, {}))
+        self._readers = [teams for teams in self._readers if teams]
+
+    def share_state(self):
+        """Copy-on-write views of the drop counts and contributors for a reader off the event loop.
+
+        The top-level dicts are copied but each team's nested dicts are shared until
+        the team next changes (see _own), so this costs O(teams) however many drops
+        have been counted. Clear the returned set once the reader is done with them.
+        """
+        teams = set(self.team_drop_counts) | set(self.drop_contributors)
+        self._readers.append(teams)
+        return teams, dict(self.team_drop_counts), dict(self.drop_contributors)
+
+    @staticmethod
+    def release_when_done(teams, future):
+        # set.clear is atomic, so the storage thread can release the teams itself
+        if future is None:
+            teams.clear()
+        else:
+            future.add_done_callback(lambda _: teams.clear())
+
+    def capture_state(self, reason):
+        """Everything a rollback restores, captured copy-on-write. Returns (shared teams, state); see share_state()."""
+        teams, drop_counts, contributors = self.share_state()
+        return teams, {
+            "event": self.id,
+            "reason": reason,
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "team_drop_counts": drop_counts,
+            "team_total_points": dict(self.team_total_points),
+            "drop_contributors": contributors,
+            "points_history": self.points_history.copy(),
+            "pending": self.approvals.to_dict(),
+        }
+
+    async def snapshot(self, reason="scheduled"):
+        """Write a compressed snapshot of the event. Only the capture runs on the event loop."""
+        async with self.snapshot_lock:
+            started_at = time.perf_counter()
+            teams, state = self.capture_state(reason)
+            metrics.observe("snapshot_capture_seconds", time.perf_counter() - started_at)
+            directory = self.file(SNAPSHOTS_DIR)
+            path = os.path.join(directory, f"{datetime.now():%Y%m%dT%H%M%S}-{reason}.json.gz")
+            try:
+                await asyncio.to_thread(os.makedirs, directory, exist_ok=True)
+                await asyncio.to_thread(write_snapshot, path, state)
+            finally:
+                teams.clear()
+            await asyncio.to_thread(self.prune_snapshots)
+        logging.info(f"Saved {reason} snapshot of {self.id} to {path}")
+        return path
+
+    def list_snapshots(self):
+        """(taken at, reason, path) for every snapshot, newest first."""
+        directory = self.file(SNAPSHOTS_DIR)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+        snapshots = []
+        for name in names:
+            if not name.endswith(".json.gz"):
+                continue
+            stamp, _, reason = name[:-len(".json.gz")].partition("-")
+            try:
+                taken_at = datetime.strptime(stamp, "%Y%m%dT%H%M%S")
+            except ValueError:
+                continue
+            snapshots.append((taken_at, reason, os.path.join(directory, name)))
+        snapshots.sort(reverse=True)
+        return snapshots
+
+    def prune_snapshots(self, keep=SNAPSHOT_KEEP):
+        for _, _, path in self.list_snapshots()[keep:]:
+            os.remove(path)
+
+    def snapshot_diff(self, state):
+        """Lines describing what restoring state would change, per team."""
+        lines = []
+        for team in dict.fromkeys([*self.team_total_points, *state["team_total_points"]]):
+            points_now = self.team_total_points.get(team, 0)
+            points_then = state["team_total_points"].get(team, 0)
+            drops_now = sum(sum(drops.values()) for drops in self.team_drop_counts.get(team, {}).values())
+            drops_then = sum(sum(drops.values()) for drops in state["team_drop_counts"].get(team, {}).values())
+            if points_now == points_then and drops_now == drops_then:
+                continue
+            points_change = points_then - points_now
+            lines.append(
+                f"**{team}**: {display_points(points_now)} → {display_points(points_then)} points "
+                f"({'+' if points_change >= 0 else ''}{display_points(points_change)}), {drops_now} → {drops_then} drops"
+            )
+        pending_now, pending_then = len(self.approvals), len(state["pending"]["pending"])
+        if pending_now != pending_then:
+            lines.append(f"Pending approvals: {pending_now} → {pending_then}")
+        return lines or ["No differences."]
+
+    def restore(self, state):
+        self.team_drop_counts = state["team_drop_counts"]
+        self.team_total_points = state["team_total_points"]
+        self.drop_contributors = state["drop_contributors"]
+        for team in self.team_roster:
+            self.team_drop_counts.setdefault(team, {})
+            self.team_total_points.setdefault(team, 0)
+        self.team_leaderboard.reset(self.team_total_points)
+        self.invalidate_team_stats()
+        self.rebuild_player_stats()
+        self.points_history.load(state["points_history"])
+        self.record_points_history()
+        self.approvals.load(state["pending"])
+        self.save()
+
+    def reset(self):
+        self.team_drop_counts = {team: {} for team in self.team_roster}
+        self.team_total_points = {team: 0 for team in self.team_roster}
+        self.drop_contributors = {}
+        self.team_leaderboard.reset(self.team_total_points)
+        self.invalidate_team_stats()
+        self.rebuild_player_stats()
+        self.points_history.clear()
+        self.record_points_history()
+        self.save()
+
+    def rescore_changed(self, old_catalog, new_catalog):
+        """Recompute totals only for teams holding drops whose scoring changed. Returns the teams rescored."""
+        changed = {key for key in old_catalog.keys() | new_catalog.keys() if old_catalog.get(key) != new_catalog.get(key)}
+        affected = [
+            team
+            for team, bosses in self.team_drop_counts.items()
+            if any((boss_name, normalize_drop(drop_name)) in changed for boss_name, drops in bosses.items() for drop_name in drops)
+        ]
+        if not affected:
+            return []
+        totals = self.scoring_engine().team_points(self.team_drop_counts, affected)
+        for team, total in totals.items():
+            self.team_total_points[team] = total
+            self.team_leaderboard.update(team, total)
+            self.invalidate_team_stats(team)
+        self.record_points_history(totals)
+        self.rebuild_player_stats()
+        self.save()
+        return affected
+
+    async def reload_config(self, force=False, rescore=RESCORE_ON_RELOAD):
+        """Reload changed config files, keeping the current version of any file that fails validation.
+
+        Returns a list of human-readable change lines.
+        """
+        async with self.config_lock:
+            report = []
+            for name, builder in CONFIG_BUILDERS:
+                path = self.file(name)
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError as e:
+                    report.append(f"❌ {name}: {e}")
+                    continue
+                if mtime == self.config_mtimes[name] and not force:
+                    continue
+                self.config_mtimes[name] = mtime
+
+                try:
+                    config = await asyncio.to_thread(builder, path)
+                except (OSError, ValueError) as e:
+                    # json.JSONDecodeError is a ValueError
+                    logging.error(f"Keeping previous {path}, new version is invalid: {e}")
+                    report.append(f"❌ {name}: {e} (kept the previous version)")
+                    continue
+
+                # Swap the file's data and every structure derived from it in one step
+                if name == "drops.json":
+                    old_catalog = self.drop_catalog
+                    changes = diff_catalog(old_catalog, config["drop_catalog"])
+                    vars(self).update(config)
+                    rescored = self.rescore_changed(old_catalog, self.drop_catalog) if changes and rescore else []
+                else:
+                    changes = diff_roster(self.team_roster, config["team_roster"], self.roster_index, config["roster_index"])
+                    vars(self).update(config)
+                    for team in self.team_roster:
+                        self.team_drop_counts.setdefault(team, {})
+                        self.team_total_points.setdefault(team, 0)
+                        if team not in self.team_leaderboard:
+                            self.team_leaderboard.update(team, self.team_total_points[team])
+                    rescored = []
+
+                logging.info(f"Reloaded {path}: {len(changes)} changes.")
+                report.append(f"**{name}**: " + (f"{len(changes)} changes" if changes else "no changes"))
+                report.extend(changes)
+                if rescored:
+                    report.append(f"Rescored {', '.join(rescored)}")
+            return report
+
+class EventRegistry:
+    """Events keyed by (guild ID, event ID), loaded on first use and evicted once idle.
+
+    Each event lives in EVENTS_DIR/<event_id>/ with its own drops.json, team_roster.json
+    and data files, plus an event.json naming its guild, admins and announcement channel.
+    Guilds without an active event there use the default event in the working directory.
+    """
+
+    def __init__(self, directory=EVENTS_DIR, idle_seconds=EVENT_IDLE_MINUTES * 60):
+        self.directory = directory
+        self.idle_seconds = idle_seconds
+        self.default = Event("default", None, ".", {
+            "admins": ADMINS,
+            "announce_channel_id": ANNOUNCE_CHANNEL_ID,
+            "storage_path": os.environ.get("STORAGE_PATH"),
+        })
+        self.active = {}
+        self._events = {}
+        self._loading = {}
+        self._closing = {}
+        self.scan()
+
+    def scan(self):
+        """Re-read every event.json and map each guild to its active event."""
+        active = {}
+        try:
+            names = sorted(os.listdir(self.directory))
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                with open(os.path.join(path, "event.json"), "r", encoding="utf-8") as f:
+                    settings = json.load(f)
+                guild_id = int(settings["guild_id"])
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logging.error(f"Skipping event {name}: {e}")
+                continue
+            if not settings.get("active", True):
+                continue
+            if guild_id in active:
+                logging.warning(f"Guild {guild_id} has more than one active event, using {active[guild_id][0]}")
+                continue
+            active[guild_id] = (name, path, settings)
+        self.active = active
+
+    def apply_settings(self):
+        """Push event.json changes found by the last scan() to events that are already loaded."""
+        for (guild_id, event_id), event in list(self._events.items()):
+            configured = self.active.get(guild_id)
+            if configured is None or configured[0] != event_id or configured[2] == event.settings:
+                continue
+            try:
+                event.apply_settings(configured[2])
+            except (ValueError, TypeError, AttributeError) as e:
+                logging.error(f"Keeping the old settings for event {event_id}: {e}")
+                continue
+            logging.info(f"Applied new settings to event {event_id} (guild {guild_id}).")
+
+    def loaded(self):
+        return [self.default, *self._events.values()]
+
+    async def get(self, guild_id):
+        configured = self.active.get(guild_id)
+        if configured is None:
+            event = self.default
+        else:
+            event_id, path, settings = configured
+            key = (guild_id, event_id)
+            event = self._events.get(key)
+            if event is None:
+                # Concurrent first commands for an event share one load
+                task = self._loading.get(key)
+                if task is None:
+                    task = self._loading[key] = asyncio.ensure_future(self._load(key, path, settings))
+                try:
+                    event = await asyncio.shield(task)
+                finally:
+                    if task.done() and self._loading.get(key) is task:
+                        del self._loading[key]
+        event.last_used = time.monotonic()
+        return event
+
+    async def _load(self, key, path, settings):
+        # An evicted copy of this event must finish writing its files before they're read again
+        closing = self._closing.get(key)
+        if closing is not None:
+            await asyncio.wait([closing])
+        started_at = time.perf_counter()
+        event = await asyncio.to_thread(Event, key[1], key[0], path, settings)
+        await asyncio.to_thread(event.load)
+        self._events[key] = event
+        logging.info(f"Loaded event {event.id} for guild {event.guild_id} in {time.perf_counter() - started_at:.2f}s.")
+        return event
+
+    async def evict_idle(self, now=None):
+        """Close and unregister events idle for longer than idle_seconds. Returns the evicted events."""
+        now = time.monotonic() if now is None else now
+        evicted = []
+        for key, event in list(self._events.items()):
+            if now - event.last_used < self.idle_seconds or event.busy():
+                continue
+            del self._events[key]
+            # Saving and joining the storage thread can block, so do it off the loop
+            task = self._closing[key] = asyncio.ensure_future(asyncio.to_thread(event.close))
+            try:
+                await task
+            except Exception as e:
+                logging.error(f"Failed to close event {event.id}: {e}")
+            finally:
+                if self._closing.get(key) is task:
+                    del self._closing[key]
+            logging.info(f"Evicted idle event {event.id} (guild {event.guild_id}).")
+            evicted.append(event)
+        return evicted
 
-        embeds.append(embed)
+events = EventRegistry()
+metrics.gauge("events_loaded", lambda: len(events.loaded()))
 
-    if not embeds:
+@client.tree.command(name="boss_drops_all", description="Shows all boss drops and points in embeds (admin only).")
+async def boss_drops_all(interaction: discord.Interaction):
+    logging.info(f"User {interaction.user.name} used /boss_drops_all")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
+        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+
+    if not event.boss_embed_batches:
         return await interaction.response.send_message("No boss drops found.", ephemeral=True)
 
-    # Send embeds in batches of 10
-    for i in range(0, len(embeds), 10):
-        batch = embeds[i:i + 10]
-        if i == 0:
-            await interaction.response.send_message(embeds=batch)
-        else:
-            await interaction.followup.send(embeds=batch)
+    # The first batch answers the interaction, the rest go out as followups
+    await interaction.response.send_message(embeds=event.boss_embed_batches[0])
+    for batch in event.boss_embed_batches[1:]:
+        await outbound.send(interaction.followup, embeds=batch, priority=INTERACTIVE)
 
 @client.tree.command(name="boss_drops", description="View drops and points for a boss.")
 @app_commands.autocomplete(boss_name=boss_autocomplete)
 async def boss_drops_command(interaction: discord.Interaction, boss_name: str):
     logging.info(f"User {interaction.user.name} used /boss_drops: boss={boss_name}")
-    if boss_name not in boss_drops:
+    event = await events.get(interaction.guild_id)
+    if boss_name not in event.boss_drops:
         await interaction.response.send_message(f"Boss '{boss_name}' not found.", ephemeral=True)
         return
 
-    drops = boss_drops[boss_name]
-    embed = discord.Embed(title=f"{boss_name}", color=discord.Color.blue())
-    for drop_info in drops:
-        drop_name = drop_info["drop"]
-        points = drop_info["points"]
-        embed.add_field(name=drop_name, value=f"Points: {points}", inline=False)
-
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await interaction.response.send_message(embeds=event.boss_embeds[boss_name], ephemeral=True)
+
+def drop_message(entry, point_value, nth, team):
+    if point_value == entry.points:
+        return f"🗡️ **{entry.drop}** from **{entry.boss}** is worth **{display_points(point_value)} points**! Added to {team}."
+    if entry.full_value_count > 1:
+        article = "an" if ordinal(nth).startswith(("8", "11", "18")) else "a"
+        return f"Congratulations on {article} {ordinal(nth)} drop! **{entry.drop}** from **{entry.boss}** is worth **{display_points(point_value)} points** since it is {article} {ordinal(nth)} drop! Added to {team}."
+    return f"Congratulations on a duplicate drop! **{entry.drop}** from **{entry.boss}** is worth **{display_points(point_value)} points** since it is a duplicate! Added to {team}."
+
+async def download_attachment(attachment, max_bytes):
+    if attachment.size > max_bytes:
+        raise ValueError(f"{attachment.filename} is over {max_bytes // (1024 * 1024)}MB")
+    chunks = []
+    received = 0
+    async with client.http_session.get(attachment.url) as response:
+        response.raise_for_status()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            received += len(chunk)
+            if received > max_bytes:
+                raise ValueError(f"{attachment.filename} is over {max_bytes // (1024 * 1024)}MB")
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+async def store_screenshot(interaction, event, screenshot, submission, embed):
+    """Download, hash and store a /drop screenshot, then note the result on the drop's reply."""
+    extension = os.path.splitext(screenshot.filename)[1].lower()[:8] or ".png"
+    try:
+        data = await download_attachment(screenshot, int(SCREENSHOT_MAX_MB * 1024 * 1024))
+        digest, first = await asyncio.to_thread(event.evidence.put, data, extension, submission)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, OSError) as e:
+        logging.error(f"Couldn't store screenshot for submission {submission['submission']}: {e}")
+        embed.set_footer(text=f"⚠️ Screenshot not saved: {e}")
+    else:
+        if first is not None:
+            metrics.inc("duplicate_screenshots_total")
+            logging.warning(f"Duplicate screenshot {digest[:12]} from {submission['user']}, first used by {first['user']} for submission {first['submission']}")
+            embed.add_field(
+                name="⚠️ Duplicate screenshot",
+                value=f"Same image as {first['user']}'s {first['drop']} from {first['boss']} ({first['team']}) at {first['ts'][:16].replace('T', ' ')}.",
+                inline=False,
+            )
+        embed.set_footer(text=f"📎 Screenshot {digest[:12]}")
+        pending = event.approvals.get(submission["pending"])
+        if pending is not None:
+            # Shown to reviewers next to the queued drop
+            pending.update(screenshot=digest, duplicate_screenshot=first is not None)
+            event.save_approvals()
+    try:
+        await interaction.edit_original_response(embed=embed)
+    except discord.HTTPException as e:
+        logging.warning(f"Couldn't update /drop reply with screenshot result: {e}")
 
 @client.tree.command(name="drop", description="Enter boss drop for your team.")
 @app_commands.autocomplete(boss_name=boss_autocomplete, drop_name=drop_autocomplete)
-async def drop(interaction: discord.Interaction, boss_name: str, drop_name: str):
-    logging.info(f"User {interaction.user.name} used /drop: boss={boss_name}, drop={drop_name}")
+async def drop(interaction: discord.Interaction, boss_name: str, drop_name: str, screenshot: discord.Attachment = None):
+    logging.info(f"User {interaction.user.name} used /drop: boss={boss_name}, drop={drop_name}, screenshot={screenshot and screenshot.filename}")
+    event = await events.get(interaction.guild_id)
     member_id = str(interaction.user.name)
 
-    team_found = None
-    for team, members in team_roster.items():
-        for member in members:
-            if member["discord_user"] == member_id:
-                team_found = team
-                break
-        if team_found:
-            break
-
-    if not team_found:
+    member = event.find_member(member_id)
+    if not member:
         return await interaction.response.send_message(f"❌ User '{member_id}' not found in any team roster.")
+    team_found = member.team
 
-    if boss_name in boss_drops:
-        drops = boss_drops[boss_name]
-        for drop in drops:
-            if drop["drop"].lower() == drop_name.lower():
-                point_value = drop["points"]
-                drop_name_clean = drop["drop"]
-
-                if team_found not in team_drop_counts:
-                    team_drop_counts[team_found] = {}
-
-                if boss_name not in team_drop_counts[team_found]:
-                    team_drop_counts[team_found][boss_name] = {}
-
-                if drop_name_clean in team_drop_counts[team_found][boss_name]:
-                    drop_count = team_drop_counts[team_found][boss_name][drop_name_clean]
-                    original_point_value = point_value
-                    if (boss_name == "Barrows Chests" or boss_name == "Moons of Peril") and drop_count >= 4:
-                        point_value /= 2
-                        point_value_display = int(point_value) if point_value.is_integer() else point_value
-                        message_addition = f"Congratulations on a 5th drop! **{drop_name_clean}** from **{boss_name}** is worth **{point_value_display} points** since it is a 5th drop! Added to {team_found}."
-                    elif not (boss_name == "Barrows Chests" or boss_name == "Moons of Peril") and drop_count >= 1:
-                        point_value /= 2
-                        point_value_display = int(point_value) if point_value.is_integer() else point_value
-                        message_addition = f"Congratulations on a duplicate drop! **{drop_name_clean}** from **{boss_name}** is worth **{point_value_display} points** since it is a duplicate! Added to {team_found}."
-                    else:
-                        message_addition = f"🗡️ **{drop_name_clean}** from **{boss_name}** is worth **{point_value} points**! Added to {team_found}."
-                    team_drop_counts[team_found][boss_name][drop_name_clean] += 1
-                else:
-                    team_drop_counts[team_found][boss_name][drop_name_clean] = 1
-                    message_addition = f"🗡️ **{drop_name_clean}** from **{boss_name}** is worth **{point_value} points**! Added to {team_found}."
-
-                team_total_points[team_found] += point_value
-                save_data()
-
-                team_color = team_colors.get(team_found, discord.Color.default())
-                embed = discord.Embed(description=message_addition, color=team_color)
-                return await interaction.response.send_message(embed=embed)
+    if boss_name not in event.boss_drops:
+        return await interaction.response.send_message(f"❌ Boss '{boss_name}' not found.")
 
+    entry = event.find_drop(boss_name, drop_name)
+    if not entry:
         return await interaction.response.send_message(f"❌ Drop '{drop_name}' not found for {boss_name}.")
 
-    return await interaction.response.send_message(f"❌ Boss '{boss_name}' not found.")
+    if screenshot is not None:
+        if not (screenshot.content_type or "").startswith("image/"):
+            return await interaction.response.send_message("❌ The screenshot must be an image.", ephemeral=True)
+        if screenshot.size > SCREENSHOT_MAX_MB * 1024 * 1024:
+            return await interaction.response.send_message(f"❌ The screenshot must be under {SCREENSHOT_MAX_MB:g}MB.", ephemeral=True)
+        await interaction.response.defer()
+
+    team_color = event.team_color(team_found)
+    pending = None
+    if event.require_approval:
+        pending, duplicate = event.queue_drop(interaction.id, member_id, team_found, entry, member_id)
+        description = f"📝 **{entry.drop}** from **{entry.boss}** is waiting for admin approval (#{pending['id']})."
+    else:
+        result = await event.submit_drop(interaction.id, member_id, team_found, entry, member_id)
+        description = drop_message(entry, result.point_value, result.nth, team_found)
+        duplicate = result.duplicate
+    embed = discord.Embed(description=description, color=team_color)
+    if screenshot is None:
+        return await interaction.response.send_message(embed=embed)
+
+    # Answer now; the download and hashing finish in the background and update this reply
+    await interaction.followup.send(embed=embed)
+    if not duplicate:
+        submission = {
+            "submission": interaction.id,
+            "pending": pending and pending["id"],
+            "user": member_id,
+            "team": team_found,
+            "boss": entry.boss,
+            "drop": entry.drop,
+            "ts": datetime.now().isoformat(timespec="seconds"),
+        }
+        client.spawn(store_screenshot(interaction, event, screenshot, submission, embed))
 
 @client.tree.command(name="drop_admin", description="Add a drop to a team (admin only).")
-@app_commands.autocomplete(team_name=team_autocomplete, boss_name=boss_autocomplete, drop_name=drop_autocomplete)
-async def drop_admin(interaction: discord.Interaction, team_name: str, boss_name: str, drop_name: str):
-    logging.info(f"Admin {interaction.user.name} used /drop_admin: team={team_name}, boss={boss_name}, drop={drop_name}")
-    if interaction.user.name not in ADMINS:
+@app_commands.autocomplete(team_name=team_autocomplete, boss_name=boss_autocomplete, drop_name=drop_autocomplete, player=team_player_autocomplete)
+async def drop_admin(interaction: discord.Interaction, team_name: str, boss_name: str, drop_name: str, player: str = None):
+    logging.info(f"Admin {interaction.user.name} used /drop_admin: team={team_name}, boss={boss_name}, drop={drop_name}, player={player}")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
         return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
 
-    if team_name not in team_roster:
+    if team_name not in event.team_roster:
         return await interaction.response.send_message(f"❌ Team '{team_name}' not found.", ephemeral=True)
 
-    if boss_name not in boss_drops:
-        return await interaction.response.send_message(f"❌ Boss '{boss_name}' not found.", ephemeral=True)
+    if player is not None and getattr(event.find_member(player), "team", None) != team_name:
+        return await interaction.response.send_message(f"❌ User '{player}' is not on {team_name}.", ephemeral=True)
 
-    found_drop = False
-    for drop in boss_drops[boss_name]:
-        if drop["drop"].lower() == drop_name.lower():
-            point_value = drop["points"]
-            drop_name_clean = drop["drop"]
-            found_drop = True
-            break
+    if boss_name not in event.boss_drops:
+        return await interaction.response.send_message(f"❌ Boss '{boss_name}' not found.", ephemeral=True)
 
-    if not found_drop:
+    entry = event.find_drop(boss_name, drop_name)
+    if not entry:
         return await interaction.response.send_message(f"❌ Drop '{drop_name}' not found for {boss_name}.", ephemeral=True)
 
-    if team_name not in team_drop_counts:
-        team_drop_counts[team_name] = {}
-
-    if boss_name not in team_drop_counts[team_name]:
-        team_drop_counts[team_name][boss_name] = {}
-
-    if drop_name_clean in team_drop_counts[team_name][boss_name]:
-        drop_count = team_drop_counts[team_name][boss_name][drop_name_clean]
-        if (boss_name == "Barrows Chests" or boss_name == "Moons of Peril") and drop_count >= 4:
-            point_value /= 2
-            point_value_display = int(point_value) if point_value.is_integer() else point_value
-            message_addition = f"Congratulations on a 5th drop! **{drop_name_clean}** from **{boss_name}** is worth **{point_value_display} points** since it is a 5th drop! Added to {team_name}."
-        elif not (boss_name == "Barrows Chests" or boss_name == "Moons of Peril") and drop_count >= 1:
-            point_value /= 2
-            point_value_display = int(point_value) if point_value.is_integer() else point_value
-            message_addition = f"Congratulations on a duplicate drop! **{drop_name_clean}** from **{boss_name}** is worth **{point_value_display} points** since it is a duplicate! Added to {team_name}."
-        else:
-            message_addition = f"🗡️ **{drop_name_clean}** from **{boss_name}** is worth **{point_value} points**! Added to {team_name}."
-        team_drop_counts[team_name][boss_name][drop_name_clean] += 1
-    else:
-        team_drop_counts[team_name][boss_name][drop_name_clean] = 1
-        message_addition = f"🗡️ **{drop_name_clean}** from **{boss_name}** is worth **{point_value} points**! Added to {team_name}."
+    result = await event.submit_drop(interaction.id, interaction.user.name, team_name, entry, player)
 
-    team_total_points[team_name] += point_value
-    save_data()
-
-    team_color = team_colors.get(team_name, discord.Color.default())
-    embed = discord.Embed(description=message_addition, color=team_color)
+    team_color = event.team_color(team_name)
+    embed = discord.Embed(description=drop_message(entry, result.point_value, result.nth, team_name), color=team_color)
     return await interaction.response.send_message(embed=embed)
 
 @client.tree.command(name="remove_drop", description="Remove a boss drop.")
 @app_commands.autocomplete(boss_name=boss_autocomplete, drop_name=drop_autocomplete)
 async def remove_drop(interaction: discord.Interaction, boss_name: str, drop_name: str):
     logging.info(f"User {interaction.user.name} used /remove_drop: boss={boss_name}, drop={drop_name}")
+    event = await events.get(interaction.guild_id)
     member_id = str(interaction.user.name)
-    team_found = None
-    for team, members in team_roster.items():
-        for member in members:
-            if member["discord_user"] == member_id and member["role"] == "leader":
-                team_found = team
-                break
-        if team_found:
-            break
-
-    if not team_found:
+    member = event.find_member(member_id)
+    if not member or member.role != "leader":
         return await interaction.response.send_message("Only team leaders can use this command.")
+    team_found = member.team
 
-    if boss_name in team_drop_counts[team_found] and drop_name in team_drop_counts[team_found][boss_name]:
-        drop_count = team_drop_counts[team_found][boss_name][drop_name]
-        if drop_count > 0:
-            drops = boss_drops[boss_name]
-            for drop in drops:
-                if drop["drop"].lower() == drop_name.lower():
-                    point_value = drop["points"]
-                    if (boss_name == "Barrows Chests" or boss_name == "Moons of Peril") and drop_count > 4:
-                        point_value /= 2
-                    elif drop_count > 1:
-                        point_value /= 2
-
-                    team_total_points[team_found] -= point_value
-                    team_drop_counts[team_found][boss_name][drop_name] -= 1
-                    if team_drop_counts[team_found][boss_name][drop_name] == 0:
-                        del team_drop_counts[team_found][boss_name][drop_name]
-                        if not team_drop_counts[team_found][boss_name]:
-                            del team_drop_counts[team_found][boss_name]
-                    save_data()
-
-                    team_color = team_colors.get(team_found, discord.Color.default())
-                    embed = discord.Embed(description=f"Removed 1 {drop_name} from {boss_name} for {team_found}.", color=team_color)
-                    return await interaction.response.send_message(embed=embed)
-        else:
-            return await interaction.response.send_message(f"❌ No {drop_name} found for {boss_name} to remove.")
+    entry = event.find_drop(boss_name, drop_name)
+    result = await event.submit_removal(interaction.id, member_id, team_found, entry) if entry else None
+    if result is None:
+        return await interaction.response.send_message(f"❌ No {drop_name} found for {boss_name} to remove.")
 
-    return await interaction.response.send_message(f"❌ No {drop_name} found for {boss_name} to remove.")
+    team_color = event.team_color(team_found)
+    embed = discord.Embed(description=f"Removed 1 {entry.drop} from {entry.boss} for {team_found}.", color=team_color)
+    return await interaction.response.send_message(embed=embed)
 
 @client.tree.command(name="remove_drop_admin", description="Remove a boss drop from a team (admin only).")
 @app_commands.autocomplete(team_name=team_autocomplete, boss_name=boss_autocomplete, drop_name=drop_autocomplete)
 async def remove_drop_admin(interaction: discord.Interaction, team_name: str, boss_name: str, drop_name: str):
     logging.info(f"Admin {interaction.user.name} used /remove_drop_admin: team={team_name}, boss={boss_name}, drop={drop_name}")
-    if interaction.user.name not in ADMINS:
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
         return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
 
-    if team_name not in team_roster:
+    if team_name not in event.team_roster:
         return await interaction.response.send_message(f"❌ Team '{team_name}' not found.", ephemeral=True)
 
-    if boss_name in team_drop_counts[team_name] and drop_name in team_drop_counts[team_name][boss_name]:
-        drop_count = team_drop_counts[team_name][boss_name][drop_name]
-        if drop_count > 0:
-            drops = boss_drops[boss_name]
-            for drop in drops:
-                if drop["drop"].lower() == drop_name.lower():
-                    point_value = drop["points"]
-                    if (boss_name == "Barrows Chests" or boss_name == "Moons of Peril") and drop_count > 4:
-                        point_value /= 2
-                    elif drop_count > 1:
-                        point_value /= 2
-
-                    team_total_points[team_name] -= point_value
-                    team_drop_counts[team_name][boss_name][drop_name] -= 1
-                    if team_drop_counts[team_name][boss_name][drop_name] == 0:
-                        del team_drop_counts[team_name][boss_name][drop_name]
-                        if not team_drop_counts[team_name][boss_name]:
-                            del team_drop_counts[team_name][boss_name]
-                    save_data()
-
-                    team_color = team_colors.get(team_name, discord.Color.default())
-                    embed = discord.Embed(description=f"Removed 1 {drop_name} from {boss_name} for {team_name}.", color=team_color)
-                    return await interaction.response.send_message(embed=embed)
-        else:
-            return await interaction.response.send_message(f"❌ No {drop_name} found for {boss_name} to remove.", ephemeral=True)
+    entry = event.find_drop(boss_name, drop_name)
+    result = await event.submit_removal(interaction.id, interaction.user.name, team_name, entry) if entry else None
+    if result is None:
+        return await interaction.response.send_message(f"❌ No {drop_name} found for {boss_name} for {team_name} to remove.", ephemeral=True)
 
-    return await interaction.response.send_message(f"❌ No {drop_name} found for {boss_name} for {team_name} to remove.", ephemeral=True)
+    team_color = event.team_color(team_name)
+    embed = discord.Embed(description=f"Removed 1 {entry.drop} from {entry.boss} for {team_name}.", color=team_color)
+    return await interaction.response.send_message(embed=embed)
+
+@client.tree.command(name="drop_bulk", description="Add many drops from a CSV or JSON file of team, boss, drop, count (admin only).")
+async def drop_bulk(interaction: discord.Interaction, drops_file: discord.Attachment):
+    logging.info(f"Admin {interaction.user.name} used /drop_bulk: file={drops_file.filename}")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
+        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+
+    await interaction.response.defer(ephemeral=True)
+    try:
+        rows = await asyncio.to_thread(parse_bulk_drops, drops_file.filename, await drops_file.read())
+    except (UnicodeDecodeError, ValueError, csv.Error) as e:
+        # json.JSONDecodeError is a ValueError; csv.Error (e.g. an oversized field) isn't
+        return await interaction.followup.send(f"❌ Couldn't read {drops_file.filename}: {e}", ephemeral=True)
+
+    valid, errors = event.validate_bulk(rows, interaction.user.name)
+    if errors:
+        # All or nothing, so a fixed file can simply be uploaded again
+        description = "\n".join(errors[:20]) + (f"\n…and {len(errors) - 20} more" if len(errors) > 20 else "")
+        embed = discord.Embed(title=f"Bulk Import Rejected ({len(errors)} errors, nothing added)", description=description, color=discord.Color.red())
+        return await interaction.followup.send(embed=embed, ephemeral=True)
+    if not valid:
+        return await interaction.followup.send(f"❌ {drops_file.filename} has no rows.", ephemeral=True)
+
+    added = event.apply_bulk(valid)
+    logging.info(f"Bulk import by {interaction.user.name}: {len(valid)} rows from {drops_file.filename}")
+    embed = discord.Embed(title="Bulk Import", description="\n".join(event.bulk_summary(valid, added))[:4000], color=discord.Color.blue())
+    await interaction.followup.send(embed=embed, ephemeral=True)
 
 @client.tree.command(name="team_stats_all", description="View drop counts and total points for all teams.")
 async def team_stats_all(interaction: discord.Interaction):
     logging.info(f"User {interaction.user.name} used /team_stats_all")
-    embeds = []
-    for team, bosses in team_drop_counts.items():
-        team_color = team_colors.get(team, discord.Color.default())
-        embed = discord.Embed(title=f"{team} Stats", color=team_color)
-        stats_text = ""
-        for boss_name, drops in bosses.items():
-            for drop_name, count in drops.items():
-                stats_text += f"- {drop_name} from {boss_name}: {count} times\n"
-        total_points = team_total_points[team]
-        total_points_display = int(total_points) if total_points.is_integer() else total_points
-        stats_text += f"**Total Points: {total_points_display}**\n"
-        embed.description = stats_text
-        embeds.append(embed)
+    event = await events.get(interaction.guild_id)
+    embeds = [event.team_stats_embed(team) for team in event.team_drop_counts]
 
     if not embeds:
         await interaction.response.send_message("No team stats available yet.")
         return
 
-    total_points_list = list(team_total_points.values())
-    if all(points == 0 for points in total_points_list):
+    if len(event.team_leaderboard) == 0 or (event.team_leaderboard.at(1)[1] == 0 and event.team_leaderboard.at(len(event.team_leaderboard))[1] == 0):
         leader_text = "**No team is currently leading.**"
         leader_embed = discord.Embed(description=leader_text, color=discord.Color.default())
     else:
-        leader = max(team_total_points, key=team_total_points.get)
-        leader_points = team_total_points[leader]
-        leader_points_display = int(leader_points) if leader_points.is_integer() else leader_points
-        leader_color = team_colors.get(leader, discord.Color.default())
+        leader, leader_points = event.team_leaderboard.at(1)
+        leader_points_display = display_points(leader_points)
+        leader_color = event.team_color(leader)
         leader_text = f"**Current Leader:** {leader} with {leader_points_display} points."
         leader_embed = discord.Embed(description=leader_text, color=leader_color)
 
-    sorted_teams = sorted(team_total_points.items(), key=lambda item: item[1], reverse=True)
-    second_place = sorted_teams[1] if len(sorted_teams) > 1 else None
-    third_place = sorted_teams[2] if len(sorted_teams) > 2 else None
+    second_place = event.team_leaderboard.at(2) if len(event.team_leaderboard) > 1 else None
+    third_place = event.team_leaderboard.at(3) if len(event.team_leaderboard) > 2 else None
 
-    leaderboard_embeds = [leader_embed]
+    podium_embeds = [leader_embed]
 
     if second_place:
-        second_place_text = f"**Second Place:** {second_place[0]} with {second_place[1]} points."
-        second_place_embed = discord.Embed(description=second_place_text, color=team_colors.get(second_place[0], discord.Color.default()))
-        leaderboard_embeds.append(second_place_embed)
+        second_place_text = f"**Second Place:** {second_place[0]} with {display_points(second_place[1])} points."
+        second_place_embed = discord.Embed(description=second_place_text, color=event.team_color(second_place[0]))
+        podium_embeds.append(second_place_embed)
 
     if third_place:
-        third_place_text = f"**Third Place:** {third_place[0]} with {third_place[1]} points."
-        third_place_embed = discord.Embed(description=third_place_text, color=team_colors.get(third_place[0], discord.Color.default()))
-        leaderboard_embeds.append(third_place_embed)
+        third_place_text = f"**Third Place:** {third_place[0]} with {display_points(third_place[1])} points."
+        third_place_embed = discord.Embed(description=third_place_text, color=event.team_color(third_place[0]))
+        podium_embeds.append(third_place_embed)
 
-    await interaction.response.send_message(embeds=embeds)
-    await interaction.channel.send(embeds=leaderboard_embeds)
+    batches = chunk_embeds(embeds)
+    await interaction.response.send_message(embeds=batches[0])
+    for batch in batches[1:]:
+        await outbound.send(interaction.followup, embeds=batch, priority=INTERACTIVE)
+    await outbound.send(interaction.channel, embeds=podium_embeds, priority=INTERACTIVE)
 
 @client.tree.command(name="team_stats", description="View drop counts and total points for your team.")
 async def team_stats(interaction: discord.Interaction):
     logging.info(f"User {interaction.user.name} used /team_stats")
+    event = await events.get(interaction.guild_id)
     member_id = str(interaction.user.name)
 
-    team_found = None
-    for team, members in team_roster.items():
-        for member in members:
-            if member["discord_user"] == member_id:
-                team_found = team
-                break
-        if team_found:
-            break
-
-    if not team_found:
+    member = event.find_member(member_id)
+    if not member:
         return await interaction.response.send_message(f"❌ User '{member_id}' not found in any team roster.")
+    team_found = member.team
+
+    await interaction.response.send_message(embed=event.team_stats_embed(team_found))
+
+@client.tree.command(name="player_stats", description="View a player's drops, points and rank on their team.")
+@app_commands.autocomplete(player=player_autocomplete)
+async def player_stats(interaction: discord.Interaction, player: str = None):
+    logging.info(f"User {interaction.user.name} used /player_stats: player={player}")
+    event = await events.get(interaction.guild_id)
+    player = player or str(interaction.user.name)
+    if player not in event.roster_index and player not in event.player_points:
+        return await interaction.response.send_message(f"❌ User '{player}' not found in any team roster.", ephemeral=True)
+
+    await interaction.response.send_message(embed=event.player_stats_embed(player))
+
+@client.tree.command(name="top_contributors", description="Show the top point contributors on each team.")
+@app_commands.autocomplete(team_name=team_autocomplete)
+async def top_contributors(interaction: discord.Interaction, team_name: str = None):
+    logging.info(f"User {interaction.user.name} used /top_contributors: team={team_name}")
+    event = await events.get(interaction.guild_id)
+    if team_name is not None and team_name not in event.team_roster:
+        return await interaction.response.send_message(f"❌ Team '{team_name}' not found.", ephemeral=True)
 
-    team_color = team_colors.get(team_found, discord.Color.default())
-    embed = discord.Embed(title=f"{team_found} Stats", color=team_color)
-    stats_text = ""
-    for boss_name, drops in team_drop_counts[team_found].items():
-        for drop_name, count in drops.items():
-            stats_text += f"- {drop_name} from {boss_name}: {count} times\n"
-    total_points = team_total_points[team_found]
-    total_points_display = int(total_points) if total_points.is_integer() else total_points
-    stats_text += f"**Total Points: {total_points_display}**\n"
-    embed.description = stats_text
+    teams = [team_name] if team_name else [team for team, _ in event.team_leaderboard.top()]
+    batches = chunk_embeds([event.top_contributors_embed(team) for team in teams])
+    await interaction.response.send_message(embeds=batches[0])
+    for batch in batches[1:]:
+        await outbound.send(interaction.followup, embeds=batch, priority=INTERACTIVE)
+
+@client.tree.command(name="recent_drops", description="Show drops submitted in the last N minutes (admin only).")
+async def recent_drops(interaction: discord.Interaction, minutes: int = 60):
+    logging.info(f"Admin {interaction.user.name} used /recent_drops: minutes={minutes}")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
+        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
 
-    await interaction.response.send_message(embed=embed)
+    since = (datetime.now() - timedelta(minutes=minutes)).isoformat(timespec="seconds")
+    recent = await event.storage.recent_events(since)
+    kept_hours = event.storage.history_hours
+    # Say so rather than pass off a shorter window as the one asked for
+    partial = f" (only the last {kept_hours:g} hours are kept)" if kept_hours is not None and minutes > kept_hours * 60 else ""
+    if not recent:
+        return await interaction.response.send_message(f"No drops in the last {minutes} minutes{partial}.", ephemeral=True)
+
+    lines = []
+    for record in recent[-20:]:
+        sign = "+" if record["type"] == "drop" else "-"
+        credit = f" for {record['player']}" if record.get("player") and record["player"] != record["user"] else ""
+        lines.append(f"`{record['ts'][11:16]}` {sign} {record['drop']} from {record['boss']} ({record['team']}, {record['user']}{credit})")
+    title = f"{len(recent)} drop events in the last {minutes} minutes{partial}"
+    embed = discord.Embed(title=title, description="\n".join(lines), color=discord.Color.blue())
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
 @client.tree.command(name="show_leaderboard", description="Shows the team leaderboard and graph (admin only).")
 async def show_leaderboard(interaction: discord.Interaction):
     logging.info(f"Admin {interaction.user.name} used /show_leaderboard")
-    if interaction.user.name not in ADMINS:
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
         await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
         return
 
     await interaction.response.defer(ephemeral=True) 
 
     try:
-        await client.announce_team_scores()
-        await client.send_graph()
-        await interaction.followup.send("Leaderboard and graph sent!", ephemeral=True)
+        await client.post_standings(event)
+        await interaction.followup.send("Leaderboard and graph updated!", ephemeral=True)
     except Exception as e:
         await interaction.followup.send(f"An error occurred: {e}", ephemeral=True)
 
+@client.tree.command(name="points_history", description="Show each team's points over time.")
+async def points_history_command(interaction: discord.Interaction, hours: int = None):
+    logging.info(f"User {interaction.user.name} used /points_history: hours={hours}")
+    event = await events.get(interaction.guild_id)
+    await interaction.response.defer()
+    png = await points_history_png(event, hours)
+    if png is None:
+        return await interaction.followup.send("Not enough points history yet.")
+    await interaction.followup.send(file=discord.File(io.BytesIO(png), filename="points_history.png"))
+
 @client.tree.command(name="recalculate_points", description="Recalculate team total points from drop counts (admin only).")
 async def recalculate_points(interaction: discord.Interaction):
     logging.info(f"Admin {interaction.user.name} used /recalculate_points")
-    if interaction.user.name not in ADMINS:
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
         return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
 
-    global team_total_points
-    team_total_points = {team: 0 for team in team_roster}
-
-    for team, bosses in team_drop_counts.items():
-        for boss_name, drops in bosses.items():
-            for drop_name, count in drops.items():
-                if boss_name in boss_drops:
-                    drops_info = boss_drops[boss_name]
-                    for drop_info in drops_info:
-                        if drop_info["drop"] == drop_name:
-                            point_value = drop_info["points"]
-                            original_point_value = point_value 
-
-                            if boss_name == "Barrows Chests" or boss_name == "Moons of Peril":
-                                if count > 4:
-                                    team_total_points[team] += (4 * point_value) + ((count - 4) * (point_value / 2))
-                                else:
-                                    team_total_points[team] += count * point_value
-                            else:
-                                if count > 1:
-                                    team_total_points[team] += point_value + ((count -1) * (point_value / 2))
-                                else:
-                                    team_total_points[team] += count * point_value
-                            break
-    save_data()
+    event.recalculate()
     await interaction.response.send_message("Team total points recalculated.", ephemeral=True)
 
+def pending_line(pending):
+    credit = f" for {pending['player']}" if pending.get("player") and pending["player"] != pending["user"] else ""
+    proof = " ⚠️ duplicate screenshot" if pending.get("duplicate_screenshot") else " 📎" if pending.get("screenshot") else ""
+    return f"`#{pending['id']}` {pending['drop']} from {pending['boss']} ({pending['team']}, {pending['user']}{credit}){proof}"
+
+@client.tree.command(name="review_drops", description="Approve or reject drops waiting for approval (admin only).")
+async def review_drops(interaction: discord.Interaction):
+    logging.info(f"Admin {interaction.user.name} used /review_drops")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
+        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+
+    if not len(event.approvals):
+        return await interaction.response.send_message("No drops are waiting for approval.", ephemeral=True)
+
+    page = 0
+    selected = []
+    # The IDs on screen; the buttons act on these, not on whatever the page holds by the time they're pressed
+    shown = []
+
+    def review_message():
+        nonlocal page
+        page = min(page, event.approvals.pages() - 1)
+        entries = event.approvals.page(page)
+        shown[:] = [pending["id"] for pending in entries]
+        description = "\n".join(pending_line(pending) for pending in entries) or "No drops are waiting for approval."
+        embed = discord.Embed(title=f"Pending Drops ({len(event.approvals)})", description=description, color=discord.Color.blue())
+        embed.set_footer(text=f"Page {page + 1} of {event.approvals.pages()} · Nothing selected acts on the whole page")
+
+        view = discord.ui.View()
+        if entries:
+            select = discord.ui.Select(
+                placeholder="Select drops (default: whole page)",
+                min_values=0,
+                max_values=len(entries),
+                options=[discord.SelectOption(label=f"#{pending['id']} {pending['drop']}"[:100], description=f"{pending['team']}, {pending['user']}"[:100], value=str(pending["id"])) for pending in entries],
+            )
+            select.callback = select_callback
+            view.add_item(select)
+        buttons = (
+            ("◀", discord.ButtonStyle.secondary, previous_callback, page == 0),
+            ("▶", discord.ButtonStyle.secondary, next_callback, page >= event.approvals.pages() - 1),
+            ("✅ Approve", discord.ButtonStyle.success, approve_callback, not entries),
+            ("❌ Reject", discord.ButtonStyle.danger, reject_callback, not entries),
+        )
+        for label, style, callback, disabled in buttons:
+            button = discord.ui.Button(style=style, label=label, disabled=disabled)
+            button.callback = callback
+            view.add_item(button)
+        return embed, view
+
+    def targets():
+        return [int(pending_id) for pending_id in selected] or list(shown)
+
+    async def refresh(interaction_button, content=None):
+        selected.clear()
+        embed, view = review_message()
+        await interaction_button.response.edit_message(content=content, embed=embed, view=view)
+
+    async def check_user(interaction_component):
+        if interaction_component.user != interaction.user:
+            await interaction_component.response.send_message("This is not your button to press", ephemeral=True)
+            return False
+        return True
+
+    async def select_callback(interaction_select: discord.Interaction):
+        if await check_user(interaction_select):
+            selected[:] = interaction_select.data.get("values", [])
+            await interaction_select.response.defer()
+
+    async def previous_callback(interaction_button: discord.Interaction):
+        nonlocal page
+        if await check_user(interaction_button):
+            page = max(page - 1, 0)
+            await refresh(interaction_button)
+
+    async def next_callback(interaction_button: discord.Interaction):
+        nonlocal page
+        if await check_user(interaction_button):
+            page += 1
+            await refresh(interaction_button)
+
+    async def approve_callback(interaction_button: discord.Interaction):
+        if await check_user(interaction_button):
+            applied, stale, added = event.approve(targets())
+            logging.info(f"Admin {interaction_button.user.name} approved pending drops {[pending['id'] for pending in applied]}")
+            content = f"✅ Approved {len(applied)} drops" + "".join(f", {team} +{display_points(points)}" for team, points in added.items())
+            if stale:
+                content += f". Dropped {len(stale)} that no longer match the roster or drop table: " + ", ".join(f"#{pending['id']}" for pending in stale)
+            await refresh(interaction_button, content[:2000])
+
+    async def reject_callback(interaction_button: discord.Interaction):
+        if await check_user(interaction_button):
+            rejected = event.reject(targets())
+            logging.info(f"Admin {interaction_button.user.name} rejected pending drops {[pending['id'] for pending in rejected]}")
+            await refresh(interaction_button, f"❌ Rejected {len(rejected)} drops.")
+
+    embed, view = review_message()
+    await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
+def rescore_preview_text(candidate_catalog, drop_counts, standings):
+    # Runs in a worker thread on copies, so drops landing meanwhile can't change it mid-pass
+    engine = ScoringEngine(candidate_catalog)
+    current = Leaderboard(dict(standings))
+    counts, unmatched = engine.count_matrix(drop_counts, [team for team, _ in standings])
+    preview = Leaderboard({team: float(total) for (team, _), total in zip(standings, engine.totals(counts))})
+
+    lines = []
+    for rank, (team, points) in enumerate(preview.top(), start=1):
+        change = current.rank(team) - rank
+        marker = f"▲{change}" if change > 0 else f"▼{-change}" if change < 0 else "–"
+        diff = points - current.score(team)
+        lines.append(f"**{rank}. {team}** {marker}: {display_points(points)} points ({'+' if diff >= 0 else ''}{display_points(diff)})")
+    if unmatched:
+        lines.append(f"\n⚠️ {unmatched} counted drops aren't in the candidate table and score 0.")
+    return "\n".join(lines)
+
+@client.tree.command(name="rescore_preview", description="Preview standings under a candidate drops.json without applying it (admin only).")
+async def rescore_preview(interaction: discord.Interaction, points_file: discord.Attachment):
+    logging.info(f"Admin {interaction.user.name} used /rescore_preview: file={points_file.filename}")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
+        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+
+    await interaction.response.defer(ephemeral=True)
+    try:
+        candidate = json.loads(await points_file.read())
+        # Same checks as /reload_config, so a bad table is reported here rather than failing mid-preview
+        validate_drops(candidate)
+        candidate_catalog = compile_catalog(candidate)
+    except (UnicodeDecodeError, ValueError, KeyError, TypeError, AttributeError) as e:
+        return await interaction.followup.send(f"❌ Couldn't read {points_file.filename} as a drops table: {e}", ephemeral=True)
+
+    text = await asyncio.to_thread(rescore_preview_text, candidate_catalog, copy.deepcopy(event.team_drop_counts), event.team_leaderboard.top())
+    embed = discord.Embed(title="Rescore Preview (not applied)", description=text, color=discord.Color.blue())
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+def format_seconds(seconds):
+    return "∞" if seconds == float("inf") else f"{seconds * 1000:g}ms"
+
+@client.tree.command(name="bot_stats", description="Show command latency and bot health metrics (admin only).")
+async def bot_stats(interaction: discord.Interaction):
+    logging.info(f"Admin {interaction.user.name} used /bot_stats")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
+        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+
+    embed = discord.Embed(title="Bot Stats", color=discord.Color.blue())
+    for title, name in (("Commands", "command_seconds"), ("Autocomplete", "autocomplete_seconds")):
+        lines = [
+            f"`{label}` n={histogram.count} p50≤{format_seconds(histogram.quantile(0.5))} p99≤{format_seconds(histogram.quantile(0.99))}"
+            for (metric, label), histogram in sorted(metrics.histograms.items(), key=lambda item: item[0][1] or "")
+            if metric == name
+        ]
+        embed.add_field(name=title, value="\n".join(lines)[:1024] or "No data yet.", inline=False)
+
+    health = []
+    for label, name in (
+        ("Loop lag", "event_loop_lag_seconds"),
+        ("Storage batch", "storage_batch_seconds"),
+        ("save_data", "save_data_seconds"),
+        ("Snapshot capture", "snapshot_capture_seconds"),
+        ("Snapshot write", "snapshot_seconds"),
+        ("Outbound wait", "outbound_wait_seconds"),
+    ):
+        histogram = metrics.histograms.get((name, None))
+        if histogram and histogram.count:
+            health.append(f"{label}: n={histogram.count} p50≤{format_seconds(histogram.quantile(0.5))} p99≤{format_seconds(histogram.quantile(0.99))}")
+    health.append(f"Outbound queue depth: {outbound.queue_depth()}")
+    health.append(f"Events loaded: {len(events.loaded())}")
+    health.append(f"429s: {metrics.counters.get(('rate_limited_total', None), 0)}")
+    errors = sum(value for (name, _), value in metrics.counters.items() if name == "command_errors_total")
+    health.append(f"Command errors: {errors}")
+    health.append("Startup: " + (", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in startup_timings.items()) or "n/a"))
+    embed.add_field(name="Health", value="\n".join(health), inline=False)
+
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@client.tree.command(name="reload_config", description="Reload drops.json and team_roster.json and show what changed (admin only).")
+async def reload_config_command(interaction: discord.Interaction, rescore: bool = True):
+    logging.info(f"Admin {interaction.user.name} used /reload_config: rescore={rescore}")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
+        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+
+    await interaction.response.defer(ephemeral=True)
+    report = await event.reload_config(force=True, rescore=rescore)
+    description = "\n".join(report)
+    if len(description) > 4000:
+        description = description[:4000] + "\n…"
+    embed = discord.Embed(title="Config Reloaded", description=description or "Nothing to reload.", color=discord.Color.blue())
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+@client.tree.command(name="rollback", description="Restore the event to the last snapshot taken at or before a time (admin only).")
+@app_commands.autocomplete(timestamp=snapshot_autocomplete)
+async def rollback(interaction: discord.Interaction, timestamp: str):
+    logging.info(f"Admin {interaction.user.name} used /rollback: timestamp={timestamp}")
+    event = await events.get(interaction.guild_id)
+    if not event.is_admin(interaction.user.name):
+        return await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+
+    try:
+        target = datetime.fromisoformat(timestamp.strip())
+    except ValueError:
+        return await interaction.response.send_message(f"❌ '{timestamp}' isn't a time like 2024-05-01 18:00.", ephemeral=True)
+
+    await interaction.response.defer(ephemeral=True)
+    snapshots = await asyncio.to_thread(event.list_snapshots)
+    match = next((snapshot for snapshot in snapshots if snapshot[0] <= target), None)
+    if match is None:
+        return await interaction.followup.send(f"❌ No snapshot at or before {target:%Y-%m-%d %H:%M}.", ephemeral=True)
+    taken_at, reason, path = match
+    try:
+        state = await asyncio.to_thread(read_snapshot, path)
+    except (OSError, EOFError, ValueError) as e:
+        # gzip.BadGzipFile is an OSError, json.JSONDecodeError a ValueError
+        return await interaction.followup.send(f"❌ Couldn't read the snapshot from {taken_at}: {e}", ephemeral=True)
+
+    diff = "\n".join(event.snapshot_diff(state))[:3800]
+    confirm_button = discord.ui.Button(style=discord.ButtonStyle.danger, label="✅ Yes, Roll Back")
+    cancel_button = discord.ui.Button(style=discord.ButtonStyle.secondary, label="❌ Cancel")
+
+    async def confirm_callback(interaction_button: discord.Interaction):
+        if interaction_button.user == interaction.user:
+            if confirm_button.disabled:
+                # A second click while the first is still rolling back
+                return await interaction_button.response.defer()
+            # Disabled before any await, so restore(state) can only run once
+            confirm_button.disabled = cancel_button.disabled = True
+            # The snapshot below can take longer than Discord waits for an answer
+            await interaction_button.response.defer(ephemeral=True)
+            await interaction.edit_original_response(view=view)
+            # The current state is snapshotted first, so a rollback can itself be rolled back
+            await event.snapshot("pre-rollback")
+            event.restore(state)
+            logging.info(f"Admin {interaction_button.user.name} rolled {event.id} back to {path}")
+            embed = discord.Embed(title=f"Rolled back to {taken_at} ({reason})", description=diff, color=discord.Color.blue())
+            await interaction_button.followup.send(embed=embed, ephemeral=True)
+            await interaction.edit_original_response(view=None) #remove buttons
+        else:
+            await interaction_button.response.send_message("This is not your button to press", ephemeral=True)
+
+    async def cancel_callback(interaction_button: discord.Interaction):
+        if interaction_button.user == interaction.user:
+            if cancel_button.disabled:
+                return await interaction_button.response.defer()
+            await interaction_button.response.send_message("Rollback cancelled.", ephemeral=True)
+            await interaction.edit_original_response(view=None) #remove buttons
+        else:
+            await interaction_button.response.send_message("This is not your button to press", ephemeral=True)
+
+    confirm_button.callback = confirm_callback
+    cancel_button.callback = cancel_callback
+
+    view = discord.ui.View()
+    view.add_item(confirm_button)
+    view.add_item(cancel_button)
+
+    embed = discord.Embed(title=f"Roll back to {taken_at} ({reason})?", description=diff, color=discord.Color.orange())
+    await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+
 @client.tree.command(name="reset_data", description="Reset team drop counts and total points (admin only).")
 async def reset_data(interaction: discord.Interaction):
     logging.info(f"Admin {interaction.user.name} used /reset_data")
-    if interaction.user.name in ADMINS:
+    event = await events.get(interaction.guild_id)
+    if event.is_admin(interaction.user.name):
         confirm_button = discord.ui.Button(style=discord.ButtonStyle.danger, label="✅ Yes, Reset Data")
         cancel_button = discord.ui.Button(style=discord.ButtonStyle.secondary, label="❌ Cancel")
 
         async def confirm_callback(interaction_button: discord.Interaction):
             if interaction_button.user == interaction.user:
-                global team_drop_counts, team_total_points
-                team_drop_counts = {team: {} for team in team_roster}
-                team_total_points = {team: 0 for team in team_roster}
-                save_data()
-                await interaction_button.response.send_message("Data reset and bot restarted.", ephemeral=True)
+                if confirm_button.disabled:
+                    # A second click while the first is still resetting
+                    return await interaction_button.response.defer()
+                confirm_button.disabled = cancel_button.disabled = True
+                # The snapshot below can take longer than Discord waits for an answer
+                await interaction_button.response.defer(ephemeral=True)
+                await interaction.edit_original_response(view=view)
+                await event.snapshot("pre-reset")
+                event.reset()
+                await interaction_button.followup.send("Data reset and bot restarted. The old data was snapshotted first, so /rollback can undo this.", ephemeral=True)
                 await interaction.edit_original_response(view=None) #remove buttons
             else:
                 await interaction_button.response.send_message("This is not your button to press", ephemeral=True)
 
         async def cancel_callback(interaction_button: discord.Interaction):
             if interaction_button.user == interaction.user:
+                if cancel_button.disabled:
+                    return await interaction_button.response.defer()
                 await interaction_button.response.send_message("Data reset cancelled.", ephemeral=True)
                 await interaction.edit_original_response(view=None) #remove buttons
             else:
@@ -577,4 +3386,35 @@ async def reset_data(interaction: discord.Interaction):
     else:
         await interaction.response.send_message("You don't have permission to reset the data.", ephemeral=True)
 
-client.run(os.environ.get("DISCORD_TOKEN"))
\ No newline at end of file
+def import_drops(path, directory="."):
+    """Apply a bulk drop file to an event's saved data without connecting to Discord.
+
+    Stop the bot first, since both would write the same files.
+    """
+    event = events.default if directory == "." else Event(os.path.basename(os.path.normpath(directory)), None, directory, {})
+    event.load()
+    try:
+        with open(path, "rb") as f:
+            rows = parse_bulk_drops(path, f.read())
+    except (UnicodeDecodeError, ValueError, csv.Error) as e:
+        print(f"Couldn't read {path}: {e}")
+        event.storage.close()
+        return 1
+    valid, errors = event.validate_bulk(rows, "import")
+    if errors:
+        print("\n".join(errors))
+        print(f"{len(errors)} errors, nothing imported.")
+        event.storage.close()
+        return 1
+    added = event.apply_bulk(valid)
+    event.close()
+    print("\n".join(event.bulk_summary(valid, added)).replace("**", ""))
+    return 0
+
+startup_timings["import"] = time.perf_counter() - module_started_at
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["import"] and len(sys.argv) in (3, 4):
+        # python extravaganza_bot.py import <drops.csv|drops.json> [event directory]
+        sys.exit(import_drops(*sys.argv[2:]))
+    client.run(os.environ.get("DISCORD_TOKEN"))
\ No newline at end of file